@@ -0,0 +1,11 @@
+"""
+Shared pytest fixtures for the scraper test scripts.
+"""
+import pytest
+from remax_test_fixtures import get_shared_browser
+
+
+@pytest.fixture(scope="session")
+def browser():
+    """One Chromium instance for the whole test session, instead of one per test"""
+    return get_shared_browser()
@@ -7,6 +7,7 @@ AgentQL provides a more intuitive way to navigate through pages within the same
 
 import agentql
 from agentql.sync_api import Page
+from playwright.sync_api import sync_playwright
 import time
 import logging
 import re
@@ -56,7 +57,7 @@ PROPERTY_LISTINGS_QUERY = """
 }
 """
 
-def scrape_remax_with_agentql(base_url, max_pages=20, output_callback=None):
+def scrape_remax_with_agentql(base_url, max_pages=20, output_callback=None, browser=None):
     """
     Scrape Remax.com.tn using AgentQL with proper hash-based pagination handling
     
@@ -65,22 +66,32 @@ def scrape_remax_with_agentql(base_url, max_pages=20, output_callback=None):
         max_pages (int): Maximum number of pages to scrape
         output_callback (function): Optional callback function to process scraped data
                                    Signature: callback(properties, page_number)
+        browser (Browser): Optional Playwright browser to open a new context in,
+                           instead of launching a browser for this scrape only
     
     Returns:
         list: All property listings found across pages
     """
     logger.info(f"Starting Remax.com.tn scraping with AgentQL: {base_url}")
     
+    # Reuse the caller's browser when given, launching one costs seconds
+    owns_browser = browser is None
+    if owns_browser:
+        playwright = sync_playwright().start()
+        browser = playwright.chromium.launch(headless=True)
+    context = browser.new_context()
+    
     # Start a new AgentQL page
-    page = agentql.wrap(base_url)
+    page = agentql.wrap(context.new_page())
+    page.goto(base_url)
     
     # Ensure we have the right hash in the URL for the first page
-    current_url = page.current_url
+    current_url = page.url
     if "#" not in current_url:
         # Add default hash parameters for the first page
         hash_url = f"{base_url}#mode=gallery&tt=261&cur=TND&sb=MostRecent&page=1&sc=1048"
         logger.info(f"Setting initial hash URL: {hash_url}")
-        page.navigate(hash_url)
+        page.goto(hash_url)
         time.sleep(3)  # Wait for page to load with hash parameters
     
     # Initial scrolling to ensure all content is loaded
@@ -97,9 +108,9 @@ def scrape_remax_with_agentql(base_url, max_pages=20, output_callback=None):
         # Query the current page for property listings
         try:
             # Get properties from the current page
-            results = session.query(PROPERTY_LISTINGS_QUERY)
-            properties_data = results.to_data().get('properties', [])
-            page_info = results.to_data().get('page_info', {})
+            results = page.query_data(PROPERTY_LISTINGS_QUERY)
+            properties_data = results.get('properties', [])
+            page_info = results.get('page_info', {})
             current_url = page_info.get('current_url', '')
             current_hash = page_info.get('page_hash', '')
             
@@ -118,8 +129,7 @@ def scrape_remax_with_agentql(base_url, max_pages=20, output_callback=None):
                 output_callback(properties_data, page_count)
             
             # Check if there's a next page
-            pagination = session.query(PAGINATION_QUERY)
-            pagination_data = pagination.to_data()
+            pagination_data = page.query_data(PAGINATION_QUERY)
             next_enabled = pagination_data.get('next_page_button_enabled', False)
             next_disabled = pagination_data.get('next_page_button_disabled', False)
             
@@ -144,12 +154,12 @@ def scrape_remax_with_agentql(base_url, max_pages=20, output_callback=None):
                     next_url = f"{current_url}#mode=gallery&tt=261&cur=TND&sb=MostRecent&page={next_page_num}&sc=1048"
                 
                 logger.info(f"Navigating to next page: {next_url}")
-                session.driver.navigate(next_url)
+                page.goto(next_url)
                 page_count += 1
                 
                 # Wait for the page to load and scroll to show all content
                 time.sleep(3)
-                session.driver.scroll_to_bottom()
+                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
                 time.sleep(1)
             else:
                 logger.info("No more pages available or reached the end")
@@ -159,8 +169,11 @@ def scrape_remax_with_agentql(base_url, max_pages=20, output_callback=None):
             logger.error(f"Error processing page {page_count}: {str(e)}")
             break
     
-    # Close the AgentQL session
-    session.close()
+    # Close the AgentQL page's context, and the browser if we launched it
+    context.close()
+    if owns_browser:
+        browser.close()
+        playwright.stop()
     logger.info(f"Remax.com.tn scraping completed. Total properties collected: {len(all_properties)}")
     return all_properties
 
@@ -0,0 +1,53 @@
+"""
+Browser shared by the Remax test scripts
+
+Launching Chromium takes a second or more, so every test of a run borrows the same
+browser instead of launching its own. It is closed when the interpreter exits.
+"""
+
+import os
+import atexit
+from contextlib import contextmanager
+from playwright.sync_api import sync_playwright
+
+# REMAX_DEBUG=1 shows the browser and slows every action down to follow the tests
+DEBUG = os.environ.get("REMAX_DEBUG") == "1"
+
+BROWSER_ARGS = [
+    '--disable-dev-shm-usage',
+    '--disable-web-security',
+    '--no-sandbox',
+    '--window-size=1920,1080'
+]
+if DEBUG:
+    BROWSER_ARGS.append('--disable-features=site-per-process')
+
+_playwright = None
+_browser = None
+
+def get_shared_browser():
+    """Return the shared browser, launching it on first use"""
+    global _playwright, _browser
+    if _browser is None:
+        _playwright = sync_playwright().start()
+        _browser = _playwright.chromium.launch(
+            headless=not DEBUG,
+            args=BROWSER_ARGS,
+            slow_mo=100 if DEBUG else 0,
+            timeout=60000
+        )
+        atexit.register(close_shared_browser)
+    return _browser
+
+def close_shared_browser():
+    """Close the shared browser and stop Playwright, if they were started"""
+    global _playwright, _browser
+    if _browser is not None:
+        _browser.close()
+        _playwright.stop()
+        _playwright = _browser = None
+
+@contextmanager
+def shared_browser():
+    """Borrow the shared browser for a with block; it stays open afterwards"""
+    yield get_shared_browser()
@@ -1,13 +1,31 @@
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 import csv
 import json
+import logging
+import logging.handlers
 import os
+import queue
+import random
 import time
 import re
+import sys
 from datetime import datetime
 from urllib.parse import urlparse
 
+# Set up logging: records go through a queue and are written to stdout by a
+# background listener thread, started and stopped by main(), so callers never
+# block on console output.
+# The LOGLEVEL environment variable selects the verbosity (INFO by default).
+log_queue = queue.Queue(-1)
+logging.basicConfig(
+    level=os.environ.get("LOGLEVEL", "INFO").upper(),
+    format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s',
+    handlers=[logging.handlers.QueueHandler(log_queue)]
+)
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+logger = logging.getLogger("TecnocasaScraper")
+
 # Load environment variables
 load_dotenv()
 
@@ -18,6 +36,9 @@ os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 # Generate timestamp for this session
 TIMESTAMP = datetime.now().strftime('%Y%m%d_%H%M%S')
 
+# Rows written to the streamed output files between two flushes
+STREAM_FLUSH_ROWS = 50
+
 # Common field names for CSV
 FIELDNAMES = [
     "title", "price", "location", "bedrooms", "bathrooms", 
@@ -25,6 +46,60 @@ FIELDNAMES = [
     "image_url", "listing_url", "source_site", "page_number", "region"
 ]
 
+# Tecnocasa specific selectors for property items
+PROPERTY_SELECTORS = (
+    ".immeuble",
+    ".views-row",
+    ".view-content .node",
+    ".annonce-wrapper",
+    ".node-immeuble",
+    "article"
+)
+PROPERTY_CARD_SELECTOR = ", ".join(PROPERTY_SELECTORS)
+
+# Different next page selectors in French
+NEXT_PAGE_SELECTORS = (
+    "li.next a",
+    "a.next",
+    ".pager-next a",
+    "a:has-text('Suivant')",
+    "a:has-text('Page suivante')",
+    "a:has-text('»')",
+    "a[rel='next']",
+    ".pagination a:has-text('›')",
+    "[aria-label='Next page']",
+    "[title='Page suivante']",
+    ".page-item:not(.disabled) a:has-text('›')",
+    ".active + li a"  # Link in the list item after the active one
+)
+
+# Page number token in paginated URLs like '?page=2' or '/page/2/'
+PAGE_NUMBER_PATTERN = re.compile(r'(?:page[=/])(\d+)')
+
+# Requests not needed for scraping (image URLs are read from the markup, not downloaded)
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_HOSTS = ("google-analytics.com", "googletagmanager.com", "facebook.net", "doubleclick.net")
+
+# Scrolls down in steps to trigger lazy loading, then back to top, all inside the page
+LAZY_LOAD_SCROLL_SCRIPT = """
+async () => {
+    for (let y = 1000; y <= 3000; y += 1000) {
+        window.scrollTo(0, y);
+        await new Promise(resolve => setTimeout(resolve, 500));
+    }
+    window.scrollTo(0, 0);
+}
+"""
+
+# Text of the first property card, compared before and after a next page click
+FIRST_CARD_TEXT_SCRIPT = "selector => document.querySelector(selector)?.textContent || ''"
+
+# True once the URL or, with pagers updating the listing in place, the first property card has changed
+PAGE_CHANGED_SCRIPT = """
+([oldUrl, oldCard, selector]) =>
+    location.href !== oldUrl || (document.querySelector(selector)?.textContent || '') !== oldCard
+"""
+
 # List of regions to scrape
 REGION_URLS = [
     "https://www.tecnocasa.tn/vendre/immeubles/nord-est-ne/bizerte.html",
@@ -73,131 +148,153 @@ def get_region_name(url):
     
     return "unknown-region"
 
+def get_pagination_template(url, page_number):
+    """Build a URL template with a {page} placeholder from a paginated URL like '...?page=1'
+    
+    Returns the template and the offset between the page number in the URL and page_number
+    (Drupal pagers start counting at 0), or (None, 0) if the URL has no page token.
+    """
+    match = PAGE_NUMBER_PATTERN.search(url)
+    if not match:
+        return None, 0
+    
+    # Escape literal braces so only the page placeholder is formatted
+    prefix = url[:match.start(1)].replace("{", "{{").replace("}", "}}")
+    suffix = url[match.end(1):].replace("{", "{{").replace("}", "}}")
+    template = prefix + "{page}" + suffix
+    return template, int(match.group(1)) - page_number
+
+def block_unneeded_resources(route):
+    """Route handler aborting images, fonts, media and analytics requests the scraper never reads"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOSTS):
+        return route.abort()
+    return route.continue_()
+
+def scroll_to_load_lazy_content(page):
+    """Scroll down the page in steps and back to top in a single browser round-trip"""
+    page.evaluate(LAZY_LOAD_SCROLL_SCRIPT)
+
+def wait_for_page_change(page, old_url, old_first_card, timeout=15000):
+    """Wait for the next page to show up after a pagination action
+    
+    Returns:
+        bool: True if the URL or the first property card changed
+    """
+    try:
+        page.wait_for_function(PAGE_CHANGED_SCRIPT, arg=[old_url, old_first_card, PROPERTY_CARD_SELECTOR], timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+    except Exception:
+        # A navigation destroyed the document the check was running in
+        return page.url != old_url
+
 def wait_with_random_delay(min_seconds=1, max_seconds=5):
     """Wait for a random time between min and max seconds to appear more human-like"""
-    import random
     delay = min_seconds + random.random() * (max_seconds - min_seconds)
     time.sleep(delay)
 
-def scrape_tecnocasa_region(url, browser, all_properties):
-    """Scrape a specific region from Tecnocasa.tn"""
+def iter_region_properties(url, context):
+    """Yield the properties of a Tecnocasa.tn region one by one, as soon as they are extracted"""
     domain = "tecnocasa.tn"
     region = get_region_name(url)
     
-    print(f"\nStarting scraping of region: {region} at URL: {url}")
-    region_properties = []
+    logger.info(f"\nStarting scraping of region: {region} at URL: {url}")
+    region_count = 0
     
-    context = browser.new_context(
-        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
-        viewport={"width": 1280, "height": 800}
-    )
     page = context.new_page()
     
     try:
         # Navigate to the URL with retry mechanism
-        print(f"Loading page...")
+        logger.info(f"Loading page...")
         max_page_load_attempts = 3
-        page_loaded = False            for attempt in range(max_page_load_attempts):
+        page_loaded = False
+        for attempt in range(max_page_load_attempts):
+            try:
+                # Try to navigate without waiting for networkidle first
+                logger.info(f"Navigating to {url} (attempt {attempt+1})")
+                page.goto(url, timeout=120000, wait_until="domcontentloaded")  # Extended timeout, less strict condition
+                
+                logger.info(f"DOM content loaded, waiting for visibility of key elements...")
+                # Wait for some key elements that indicate the page is usable
                 try:
-                    # Try to navigate without waiting for networkidle first
-                    print(f"Navigating to {url} (attempt {attempt+1})")
-                    page.goto(url, timeout=120000, wait_until="domcontentloaded")  # Extended timeout, less strict condition
-                    
-                    print(f"DOM content loaded, waiting for visibility of key elements...")
-                    # Wait for some key elements that indicate the page is usable
-                    try:
-                        # Wait for any of these selectors to appear (indicating page is somewhat loaded)
-                        selectors = ["img", ".immeuble", ".views-row", "a", ".node", ".annonce-wrapper", ".header", "h1", "h2"]
-                        for selector in selectors:
-                            try:
-                                page.wait_for_selector(selector, timeout=15000, state="visible")
-                                print(f"Found visible element with selector: {selector}")
-                                break
-                            except:
-                                continue
-                    except:
-                        print("Could not find any key elements but continuing...")
-                    
-                    # Try to wait for network idle but don't fail if it times out
-                    try:
-                        print("Waiting for network to become idle (but will continue regardless)...")
-                        page.wait_for_load_state("networkidle", timeout=30000)
-                        print("Network is idle")
-                    except:
-                        print("Network not idle, but continuing anyway...")
-                    
-                    page_loaded = True
-                    print(f"Page considered loaded on attempt {attempt+1}")
-                    break
-                except Exception as e:
-                    print(f"Error loading page on attempt {attempt+1}: {str(e)}")
-                    if attempt < max_page_load_attempts - 1:
-                        print(f"Waiting before retry...")
-                        time.sleep(30)  # Longer wait between retries
-                        
-                        # Try to reset browser context if we're having persistent issues
-                        if attempt == 1:
-                            try:
-                                print("Trying to reset browser context...")
-                                context.close()
-                                context = browser.new_context(
-                                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
-                                    viewport={"width": 1280, "height": 800}
-                                )
-                                page = context.new_page()
-                            except:
-                                print("Failed to reset context, continuing with current one...")
-                    else:
-                        print(f"Warning: Failed to load page after {max_page_load_attempts} attempts, but will try to continue with partial content")
-        
+                    # Wait for any of these selectors to appear (indicating page is somewhat loaded)
+                    selectors = ["img", ".immeuble", ".views-row", "a", ".node", ".annonce-wrapper", ".header", "h1", "h2"]
+                    for selector in selectors:
+                        try:
+                            page.wait_for_selector(selector, timeout=15000, state="visible")
+                            logger.debug(f"Found visible element with selector: {selector}")
+                            break
+                        except:
+                            continue
+                except:
+                    logger.warning("Could not find any key elements but continuing...")
+                
+                # Try to wait for network idle but don't fail if it times out
+                try:
+                    logger.info("Waiting for network to become idle (but will continue regardless)...")
+                    page.wait_for_load_state("networkidle", timeout=30000)
+                    logger.info("Network is idle")
+                except:
+                    logger.warning("Network not idle, but continuing anyway...")
+                
+                page_loaded = True
+                logger.info(f"Page considered loaded on attempt {attempt+1}")
+                break
+            except Exception as e:
+                logger.error(f"Error loading page on attempt {attempt+1}: {str(e)}")
+                if attempt < max_page_load_attempts - 1:
+                    logger.info(f"Waiting before retry...")
+                    time.sleep(30)  # Longer wait between retries
+                    
+                    # Try a fresh page if we're having persistent issues
+                    if attempt == 1:
+                        try:
+                            logger.info("Trying to reset the page...")
+                            page.close()
+                            page = context.new_page()
+                        except:
+                            logger.warning("Failed to reset page, continuing with current one...")
+                else:
+                    logger.warning(f"Failed to load page after {max_page_load_attempts} attempts, but will try to continue with partial content")
+    
         # Wait longer for the page to fully render
-        print("Waiting for page to fully initialize...")
+        logger.info("Waiting for page to fully initialize...")
         time.sleep(8)
         
         # Take a screenshot for debugging
         screenshot_file = f"{domain}_{region}_homepage.png"
         page.screenshot(path=os.path.join(OUTPUT_FOLDER, screenshot_file))
-        print(f"Saved screenshot to {screenshot_file}")
+        logger.info(f"Saved screenshot to {screenshot_file}")
         
         # Scroll down to load lazy content with multiple scrolls
-        print("Scrolling to load more content...")
-        for scroll in range(3):  # Multiple scrolls for better content loading
-            print(f"Scroll {scroll+1}/3")
-            page.evaluate(f"window.scrollTo(0, {(scroll+1) * 1000})")
-            time.sleep(3)  # Wait between scrolls
-        
-        page.evaluate("window.scrollTo(0, 0)")  # Back to top
-        time.sleep(3)
+        logger.info("Scrolling to load more content...")
+        scroll_to_load_lazy_content(page)
         
         page_count = 1
         max_pages = 15  # Increased from 10 to handle more pages per region
         
+        # Pagination URL pattern, detected after the first successful next page click
+        url_template = None
+        page_offset = 0
+        
         # Process each page
         while page_count <= max_pages:
-            print(f"Processing {region} page {page_count}...")
+            logger.info(f"Processing {region} page {page_count}...")
             
             # Take a screenshot for debugging
             screenshot_file = f"{domain}_{region}_page{page_count}.png"
             page.screenshot(path=os.path.join(OUTPUT_FOLDER, screenshot_file))
-            print(f"Saved screenshot to {screenshot_file}")
-            
-            # Get property items - Tecnocasa specific selectors
-            property_selectors = [
-                ".immeuble", 
-                ".views-row",
-                ".view-content .node",
-                ".annonce-wrapper",
-                ".node-immeuble",
-                "article"
-            ]
+            logger.info(f"Saved screenshot to {screenshot_file}")
             
             # Try each selector with patience
             property_locator = None
             property_count = 0
             
-            for selector in property_selectors:
+            for selector in PROPERTY_SELECTORS:
                 try:
-                    print(f"Trying selector: {selector}")
+                    logger.debug(f"Trying selector: {selector}")
                     # Wait longer for content to appear
                     try:
                         page.wait_for_selector(selector, timeout=15000, state="visible")
@@ -206,17 +303,17 @@ def scrape_tecnocasa_region(url, browser, all_properties):
                     
                     count = page.locator(selector).count()
                     if count > 0:
-                        print(f"Found {count} properties with selector: {selector}")
+                        logger.info(f"Found {count} properties with selector: {selector}")
                         property_locator = page.locator(selector)
                         property_count = count
                         break
                     else:
-                        print(f"No elements found with selector: {selector}")
+                        logger.debug(f"No elements found with selector: {selector}")
                 except Exception as e:
-                    print(f"Error with selector '{selector}': {str(e)}")
+                    logger.debug(f"Error with selector '{selector}': {str(e)}")
             
             if not property_locator or property_count == 0:
-                print("No properties found with primary selectors, trying alternatives...")
+                logger.warning("No properties found with primary selectors, trying alternatives...")
                 
                 # More generic backup selectors
                 backup_selectors = [
@@ -233,12 +330,12 @@ def scrape_tecnocasa_region(url, browser, all_properties):
                     try:
                         count = page.locator(selector).count()
                         if count > 0:
-                            print(f"Found {count} potential properties with backup selector: {selector}")
+                            logger.info(f"Found {count} potential properties with backup selector: {selector}")
                             property_locator = page.locator(selector)
                             property_count = count
                             break
                     except Exception as e:
-                        print(f"Error with backup selector '{selector}': {str(e)}")
+                        logger.debug(f"Error with backup selector '{selector}': {str(e)}")
                 
                 if not property_locator or property_count == 0:
                     # Save HTML for debugging
@@ -246,24 +343,24 @@ def scrape_tecnocasa_region(url, browser, all_properties):
                     html_file = os.path.join(OUTPUT_FOLDER, f"{domain}_{region}_page{page_count}.html")
                     with open(html_file, "w", encoding="utf-8") as f:
                         f.write(html)
-                    print(f"Saved HTML to {html_file} for debugging")
+                    logger.info(f"Saved HTML to {html_file} for debugging")
                     
-                    print("No properties found, moving to next page or region")
+                    logger.warning("No properties found, moving to next page or region")
                     # We'll try one more page before giving up
                     if page_count == 1:
-                        print("First page had no properties, trying to navigate to next page anyway...")
+                        logger.warning("First page had no properties, trying to navigate to next page anyway...")
                     else:
                         break
             
             # Process each property with patience
             for i in range(property_count):
                 try:
-                    print(f"Processing property {i+1}/{property_count}...")
+                    logger.debug(f"Processing property {i+1}/{property_count}...")
                     # Select current property with timeout
                     try:
                         current_property = property_locator.nth(i)
                     except Exception as e:
-                        print(f"Could not select property {i+1}: {str(e)}")
+                        logger.warning(f"Could not select property {i+1}: {str(e)}")
                         continue
                     
                     # Take property-specific screenshot for debugging complex cases
@@ -271,9 +368,9 @@ def scrape_tecnocasa_region(url, browser, all_properties):
                         try:
                             screenshot_path = os.path.join(OUTPUT_FOLDER, f"{domain}_{region}_property1.png")
                             current_property.screenshot(path=screenshot_path)
-                            print(f"Saved property screenshot to {screenshot_path}")
+                            logger.info(f"Saved property screenshot to {screenshot_path}")
                         except:
-                            print("Could not take property screenshot")
+                            logger.warning("Could not take property screenshot")
                     
                     # Get property HTML for debugging
                     try:
@@ -282,10 +379,10 @@ def scrape_tecnocasa_region(url, browser, all_properties):
                             html_path = os.path.join(OUTPUT_FOLDER, f"{domain}_{region}_property1.html")
                             with open(html_path, "w", encoding="utf-8") as f:
                                 f.write(property_html)
-                            print(f"Saved property HTML to {html_path}")
+                            logger.info(f"Saved property HTML to {html_path}")
                     except:
                         property_html = ""
-                        print("Could not extract property HTML")
+                        logger.warning("Could not extract property HTML")
                     
                     # Extract data with specific French selectors for Tecnocasa
                     
@@ -588,258 +685,291 @@ def scrape_tecnocasa_region(url, browser, all_properties):
                     
                     # Only add if we have some basic data
                     if (title or property_type) and (price or location or area):
-                        region_properties.append(property_data)
-                        all_properties.append(property_data)
-                        print(f"  Added property {i+1}: {title[:30]}... | {price} | {location}")
+                        region_count += 1
+                        logger.info(f"  Added property {i+1}: {title[:30]}... | {price} | {location}")
+                        yield property_data
                     
                     # Add a small delay between properties to avoid overloading the server
                     wait_with_random_delay(1, 3)
                     
                 except Exception as e:
-                    print(f"Error processing property {i+1}: {str(e)}")
+                    logger.error(f"Error processing property {i+1}: {str(e)}")
             
-            # Save data after each page to avoid losing progress
-            if region_properties:
-                intermediate_csv = os.path.join(OUTPUT_FOLDER, f"{domain}_{region}_{TIMESTAMP}_page{page_count}.csv")
-                intermediate_json = os.path.join(OUTPUT_FOLDER, f"{domain}_{region}_{TIMESTAMP}_page{page_count}.json")
+            # Check if there's a next page
+            if page_count < max_pages:
+                logger.info("Checking for next page button...")
+                # Save the current URL to compare after clicking
+                current_url = page.url
                 
-                save_to_csv(region_properties, intermediate_csv)
-                save_to_json(region_properties, intermediate_json)
-                print(f"Saved {len(region_properties)} properties to intermediate files")                # Check if there's a next page
-                if page_count < max_pages:
-                    # Different next page selectors in French
-                    next_page_selectors = [
-                        "li.next a", 
-                        "a.next",
-                        ".pager-next a",
-                        "a:has-text('Suivant')",
-                        "a:has-text('Page suivante')",
-                        "a:has-text('»')",
-                        "a[rel='next']",
-                        ".pagination a:has-text('›')",
-                        "[aria-label='Next page']",
-                        "[title='Page suivante']",
-                        ".page-item:not(.disabled) a:has-text('›')",
-                        ".active + li a"  # Link in the list item after the active one
-                    ]
-                    
-                    print("Checking for next page button...")
-                    # Save the current URL to compare after clicking
-                    current_url = page.url
+                next_clicked = False
+
+                # Once the pagination URL pattern is known, go straight to the next page
+                if url_template:
+                    next_url = url_template.format(page=page_count + 1 + page_offset)
+                    logger.info(f"Navigating directly to next page URL: {next_url}")
+                    try:
+                        response = page.goto(next_url, timeout=90000, wait_until="domcontentloaded")
+                        if response and response.status < 400 and page.locator(PROPERTY_CARD_SELECTOR).count() > 0:
+                            page_count += 1
+                            next_clicked = True
+                        else:
+                            logger.info("Next page URL returned no properties, falling back to next page selectors...")
+                    except Exception as e:
+                        logger.error(f"Error navigating to next page URL: {str(e)}")
                     
-                    next_clicked = False
-                    for selector in next_page_selectors:
+                    if not next_clicked:
+                        url_template = None
+                        page.goto(current_url, timeout=90000, wait_until="domcontentloaded")
+                
+                if not next_clicked:
+                    for selector in NEXT_PAGE_SELECTORS:
                         try:
                             next_button = page.locator(selector)
                             if next_button.count() > 0:
                                 try:
                                     next_visible = next_button.first.is_visible()
-                                    print(f"Found next page button with selector: {selector}, visible: {next_visible}")
-                                    
+                                    logger.debug(f"Found next page button with selector: {selector}, visible: {next_visible}")
+                                
                                     if next_visible:
-                                        # Save URLs to detect navigation
+                                        # Save URL and first listing to detect the next page
                                         old_url = page.url
-                                        
+                                        old_first_card = page.evaluate(FIRST_CARD_TEXT_SCRIPT, PROPERTY_CARD_SELECTOR)
+                                    
                                         # Take screenshot before clicking
                                         before_click_file = os.path.join(OUTPUT_FOLDER, f"{domain}_{region}_before_next_page{page_count}.png")
                                         page.screenshot(path=before_click_file)
-                                        print(f"Saved screenshot before clicking next: {before_click_file}")
-                                        
-                                        # Try different click methods
+                                        logger.info(f"Saved screenshot before clicking next: {before_click_file}")
+                                    
+                                        # Try different click methods, moving to the next one only when the
+                                        # page did not change, so a working pager is never clicked twice
                                         click_attempts = 0
                                         clicked = False
-                                        
+                                    
                                         while click_attempts < 3 and not clicked:
                                             try:
                                                 if click_attempts == 0:
-                                                    print("Trying normal click...")
+                                                    logger.debug("Trying normal click...")
                                                     next_button.first.click(timeout=15000)
                                                 elif click_attempts == 1:
-                                                    print("Trying JS click...")
+                                                    logger.debug("Trying JS click...")
                                                     page.evaluate(f"document.querySelector('{selector}').click()")
                                                 else:
-                                                    print("Trying navigate to href...")
+                                                    logger.debug("Trying navigate to href...")
                                                     href = next_button.first.get_attribute("href")
                                                     if href:
                                                         if not href.startswith(("http://", "https://")):
                                                             base_url = f"https://{domain}"
                                                             href = f"{base_url}{href if href.startswith('/') else '/' + href}"
-                                                        print(f"Navigating directly to next page URL: {href}")
-                                                        page.goto(href, timeout=90000, wait_until="domcontentloaded")
-                                                
-                                                clicked = True
+                                                        logger.info(f"Navigating directly to next page URL: {href}")
+                                                        # Only the response is needed, the property cards are what we wait for
+                                                        page.goto(href, timeout=90000, wait_until="commit")
+                                                        page.wait_for_selector(PROPERTY_CARD_SELECTOR, timeout=30000, state="attached")
                                             except Exception as e:
-                                                print(f"Click attempt {click_attempts+1} failed: {str(e)}")
+                                                # A click that navigates can fail while tearing down the page,
+                                                # the change check below decides whether it worked
+                                                logger.debug(f"Click attempt {click_attempts+1} failed: {str(e)}")
+                                            
+                                            logger.info("Waiting for navigation or content change...")
+                                            clicked = wait_for_page_change(page, old_url, old_first_card)
+                                            if not clicked:
                                                 click_attempts += 1
-                                                time.sleep(5)
-                                        
+                                    
                                         if clicked:
-                                            # Wait for URL to change or content to change
                                             try:
-                                                print("Waiting for navigation or content change...")
-                                                # First try to detect URL change
-                                                change_detected = False
-                                                for check in range(5):  # Check a few times
-                                                    new_url = page.url
-                                                    if new_url != old_url:
-                                                        print(f"URL changed from {old_url} to {new_url}")
-                                                        change_detected = True
-                                                        break
-                                                    
-                                                    # If URL didn't change, check if content changed
-                                                    if check == 2:  # On middle check, try to detect content change
-                                                        try:
-                                                            # Take a screenshot to see if page changed
-                                                            after_click_file = os.path.join(OUTPUT_FOLDER, f"{domain}_{region}_after_next_page{page_count}.png")
-                                                            page.screenshot(path=after_click_file)
-                                                            print(f"Saved screenshot after clicking next: {after_click_file}")
-                                                        except:
-                                                            pass
-                                                    
-                                                    # Wait briefly before checking again
-                                                    time.sleep(5)
-                                                
+                                                change_detected = page.url != old_url
+                                                if change_detected:
+                                                    logger.info(f"URL changed from {old_url} to {page.url}")
+                                            
                                                 if change_detected or True:  # Continue anyway
                                                     page_count += 1
                                                     next_clicked = True
                                                     
+                                                    # Remember the pagination URL pattern to skip the selector probing next time
+                                                    if change_detected:
+                                                        url_template, page_offset = get_pagination_template(page.url, page_count)
+                                                        if url_template:
+                                                            logger.info(f"Detected pagination URL template: {url_template}")
+                                                
                                                     # Wait for page to load with longer timeout, but don't fail if it times out
                                                     try:
                                                         page.wait_for_load_state("domcontentloaded", timeout=45000)
                                                     except:
-                                                        print("Timeout waiting for page to load, continuing anyway...")
-                                                    
+                                                        logger.warning("Timeout waiting for page to load, continuing anyway...")
+                                                
                                                     # Wait additional time
-                                                    print("Waiting for next page to fully load...")
+                                                    logger.info("Waiting for next page to fully load...")
                                                     time.sleep(15)
-                                                    
+                                                
                                                     # Scroll down to load lazy content
-                                                    for scroll in range(3):
-                                                        page.evaluate(f"window.scrollTo(0, {(scroll+1) * 1000})")
-                                                        time.sleep(3)
-                                                    
-                                                    page.evaluate("window.scrollTo(0, 0)")
-                                                    time.sleep(3)
+                                                    scroll_to_load_lazy_content(page)
                                                     break
                                             except Exception as e:
-                                                print(f"Error after clicking next: {str(e)}")
+                                                logger.error(f"Error after clicking next: {str(e)}")
                                 except Exception as e:
-                                    print(f"Error checking visibility of next button: {str(e)}")
+                                    logger.debug(f"Error checking visibility of next button: {str(e)}")
                         except Exception as e:
-                            print(f"Error with next page selector '{selector}': {str(e)}")
-                    
-                    if not next_clicked:
-                        print("No next page button found or all attempts failed. Ending pagination for this region.")
-                        break
-                else:
-                    print(f"Reached maximum page limit ({max_pages}). Stopping pagination for this region.")
+                            logger.debug(f"Error with next page selector '{selector}': {str(e)}")
+                
+                if not next_clicked:
+                    logger.warning("No next page button found or all attempts failed. Ending pagination for this region.")
                     break
-        
-        print(f"Completed scraping of region {region}. Total properties: {len(region_properties)}")
-        
-        # Save region-specific results
-        if region_properties:
-            region_csv = os.path.join(OUTPUT_FOLDER, f"{domain}_{region}_{TIMESTAMP}_full.csv")
-            region_json = os.path.join(OUTPUT_FOLDER, f"{domain}_{region}_{TIMESTAMP}_full.json")
-            
-            save_to_csv(region_properties, region_csv)
-            save_to_json(region_properties, region_json)
-            
-            print(f"Saved region data to:")
-            print(f"- CSV: {region_csv}")
-            print(f"- JSON: {region_json}")
+            else:
+                logger.info(f"Reached maximum page limit ({max_pages}). Stopping pagination for this region.")
+                break
+    
+        logger.info(f"Completed scraping of region {region}. Total properties: {region_count}")
         
     except Exception as e:
-        print(f"Error scraping region {region}: {str(e)}")
+        logger.error(f"Error scraping region {region}: {str(e)}")
     finally:
-        context.close()
-    
-    return region_properties
+        page.close()
 
-def save_to_csv(data, filename):
-    """Save the scraped data to a CSV file"""
-    with open(filename, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=FIELDNAMES)
-        writer.writeheader()
-        
-        for prop in data:
-            # Create a row with all possible fields
-            row = {field: "" for field in FIELDNAMES}
+def scrape_tecnocasa_region(url, context, combined_writer, seen_urls):
+    """Scrape a region, streaming each new property to the region files and the combined writer
+    
+    Properties whose listing URL is already in seen_urls are skipped.
+    Returns the number of properties this call wrote for the region.
+    """
+    region = get_region_name(url)
+    region_csv = os.path.join(OUTPUT_FOLDER, f"tecnocasa.tn_{region}_{TIMESTAMP}_full.csv")
+    region_jsonl = os.path.join(OUTPUT_FOLDER, f"tecnocasa.tn_{region}_{TIMESTAMP}_full.jsonl")
+    
+    with PropertyStreamWriter(region_csv, region_jsonl) as region_writer:
+        for prop in iter_region_properties(url, context):
+            listing_url = prop["listing_url"]
+            if listing_url:
+                if listing_url in seen_urls:
+                    continue
+                seen_urls.add(listing_url)
             
-            # Update with available data
-            for key, value in prop.items():
-                if key in FIELDNAMES:
-                    row[key] = value
-                    
-            writer.writerow(row)
+            region_writer.write(prop)
+            combined_writer.write(prop)
+    
+    if region_writer.count:
+        logger.info(f"Saved region data to:")
+        logger.info(f"- CSV: {region_csv}")
+        logger.info(f"- JSON Lines: {region_jsonl}")
     
-    print(f"Data saved to: {filename}")
+    return region_writer.count
 
-def save_to_json(data, filename):
-    """Save the scraped data to a JSON file"""
-    with open(filename, "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=4, ensure_ascii=False)
+class PropertyStreamWriter:
+    """Write properties to a CSV file and a JSON Lines file as they are scraped
     
-    print(f"Data saved to: {filename}")
+    The files are only created when the first property arrives. They are opened in
+    append mode, so a retried region adds to what the earlier attempts wrote, and
+    flushed every STREAM_FLUSH_ROWS rows and on close.
+    """
+    
+    def __init__(self, csv_filename, jsonl_filename):
+        self.csv_filename = csv_filename
+        self.jsonl_filename = jsonl_filename
+        self.csv_file = None
+        self.jsonl_file = None
+        self.writer = None
+        self.count = 0
+    
+    def write(self, prop):
+        """Append one property to both files"""
+        if self.writer is None:
+            self.csv_file = open(self.csv_filename, "a", newline="", encoding="utf-8")
+            self.jsonl_file = open(self.jsonl_filename, "a", encoding="utf-8")
+            self.writer = csv.DictWriter(self.csv_file, fieldnames=FIELDNAMES, restval="", extrasaction="ignore")
+            # Header only at the top of a new file
+            if self.csv_file.tell() == 0:
+                self.writer.writeheader()
+        
+        self.writer.writerow(prop)
+        self.jsonl_file.write(json.dumps(prop, ensure_ascii=False) + "\n")
+        self.count += 1
+        if self.count % STREAM_FLUSH_ROWS == 0:
+            self.csv_file.flush()
+            self.jsonl_file.flush()
+    
+    def close(self):
+        """Close the files, flushing the last rows, if any property was written"""
+        if self.writer is not None:
+            self.csv_file.close()
+            self.jsonl_file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 def main():
     """Main function to scrape Tecnocasa.tn for multiple regions"""
-    print(f"Starting multi-region Tecnocasa scraper at {TIMESTAMP}")
-    print(f"Will scrape {len(REGION_URLS)} regions")
-    
-    all_properties = []
-    
-    with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(
-            headless=False,
-            # Slow down operation to avoid being blocked
-            slow_mo=200
-        )
+    log_listener.start()
+    try:
+        logger.info(f"Starting multi-region Tecnocasa scraper at {TIMESTAMP}")
+        logger.info(f"Will scrape {len(REGION_URLS)} regions")
+        
+        csv_filename = os.path.join(OUTPUT_FOLDER, f"tecnocasa.tn_all_regions_{TIMESTAMP}_full.csv")
+        jsonl_filename = os.path.join(OUTPUT_FOLDER, f"tecnocasa.tn_all_regions_{TIMESTAMP}_full.jsonl")
         
-        # Process each region with retry mechanism
-        for url in REGION_URLS:
-            attempts = 0
-            max_attempts = 3
-            region_scraped = False
+        # Properties are streamed to the combined files instead of being kept in memory
+        combined_writer = PropertyStreamWriter(csv_filename, jsonl_filename)
+        seen_urls = set()
+        
+        with sync_playwright() as playwright, combined_writer:
+            browser = playwright.chromium.launch(
+                headless=False,
+                # Slow down operation to avoid being blocked
+                slow_mo=200
+            )
             
-            while attempts < max_attempts and not region_scraped:
-                try:
-                    print(f"Attempt {attempts+1}/{max_attempts} for region URL: {url}")
-                    region_properties = scrape_tecnocasa_region(url, browser, all_properties)
-                    if region_properties:
-                        print(f"Successfully scraped {len(region_properties)} properties from {url}")
-                        region_scraped = True
-                    else:
-                        print(f"No properties found in attempt {attempts+1}. Waiting before retry...")
-                        time.sleep(30)  # Wait between retries
-                        attempts += 1
-                except Exception as e:
-                    print(f"Error during attempt {attempts+1} for {url}: {str(e)}")
-                    attempts += 1
-                    time.sleep(45)  # Longer wait after an error
+            # One context for all regions keeps connections and caches to the site warm
+            context = browser.new_context(
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
+                viewport={"width": 1280, "height": 800},
+                locale="fr-FR"
+            )
+            context.route("**/*", block_unneeded_resources)
             
-            if not region_scraped:
-                print(f"Failed to scrape region after {max_attempts} attempts: {url}")
+            # Process each region with retry mechanism
+            for url in REGION_URLS:
+                max_attempts = 3
+                region_scraped = False
+                
+                for attempt in range(max_attempts):
+                    try:
+                        logger.info(f"Attempt {attempt+1}/{max_attempts} for region URL: {url}")
+                        region_count = scrape_tecnocasa_region(url, context, combined_writer, seen_urls)
+                        if region_count:
+                            logger.info(f"Successfully scraped {region_count} properties from {url}")
+                            region_scraped = True
+                            break
+                        logger.warning(f"No properties found in attempt {attempt+1}")
+                    except Exception as e:
+                        logger.error(f"Error during attempt {attempt+1} for {url}: {str(e)}")
+                    
+                    if attempt < max_attempts - 1:
+                        # Exponential backoff with jitter so retries don't hit the server in lockstep
+                        backoff = min(60, 5 * (2 ** attempt)) + random.uniform(0, 3)
+                        logger.info(f"Waiting {backoff:.1f} seconds before retry...")
+                        time.sleep(backoff)
+                
+                if not region_scraped:
+                    logger.warning(f"Failed to scrape region after {max_attempts} attempts: {url}")
+                
+                # Wait between regions to avoid overloading the server
+                delay = random.uniform(10, 20)
+                logger.info(f"Waiting {delay:.1f} seconds before proceeding to the next region...")
+                time.sleep(delay)
             
-            # Wait between regions to avoid overloading the server
-            print(f"Waiting 1 minute before proceeding to the next region...")
-            time.sleep(60)
-        
-        browser.close()
-    
-    # Save final combined results
-    if all_properties:
-        csv_filename = os.path.join(OUTPUT_FOLDER, f"tecnocasa.tn_all_regions_{TIMESTAMP}_full.csv")
-        json_filename = os.path.join(OUTPUT_FOLDER, f"tecnocasa.tn_all_regions_{TIMESTAMP}_full.json")
-        
-        save_to_csv(all_properties, csv_filename)
-        save_to_json(all_properties, json_filename)
+            context.close()
+            browser.close()
         
-        print(f"\nScraping completed. Total properties collected across all regions: {len(all_properties)}")
-        print(f"- CSV file: {csv_filename}")
-        print(f"- JSON file: {json_filename}")
-    else:
-        print("\nNo properties were collected from any region.")
+        # Report the combined results
+        if combined_writer.count:
+            logger.info(f"\nScraping completed. Total properties collected across all regions: {combined_writer.count}")
+            logger.info(f"- CSV file: {csv_filename}")
+            logger.info(f"- JSON Lines file: {jsonl_filename}")
+        else:
+            logger.info("\nNo properties were collected from any region.")
+    finally:
+        # Write out the queued log records before returning
+        log_listener.stop()
 
 if __name__ == "__main__":
     main()
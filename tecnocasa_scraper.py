@@ -1,20 +1,43 @@
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+import asyncio
 import csv
 import json
 import os
-import time
+import re
 from datetime import datetime
+from pathlib import Path
+from urllib.parse import urljoin
+
+# orjson is optional: without it the standard json module is used
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# httpx is optional: without it the listing pages are always loaded in the browser
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# selectolax is optional: without it the extraction runs in the browser
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
 
 # Load environment variables
 load_dotenv()
 
-# Create output folder
-OUTPUT_FOLDER = "real_estate_data"
-os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+# Debug screenshots are only taken with SCRAPER_DEBUG=1
+DEBUG = os.getenv("SCRAPER_DEBUG") == "1"
 
-# Generate timestamp for this session
-TIMESTAMP = datetime.now().strftime('%Y%m%d_%H%M%S')
+# Output folder, created by main() along with the timestamp of each run
+OUTPUT_FOLDER = "real_estate_data"
 
 # Common field names for CSV
 FIELDNAMES = [
@@ -23,298 +46,529 @@ FIELDNAMES = [
     "image_url", "listing_url", "source_site", "page_number"
 ]
 
-def scrape_tecnocasa():
-    """Scrape Tecnocasa.tn"""
-    url = "https://www.tecnocasa.tn/vendre/immeubles/nord-est-ne/cap-bon/kelibia.html"
-    domain = "tecnocasa.tn"
+# Relative image and listing URLs are resolved against the site root
+BASE_URL = "https://www.tecnocasa.tn/"
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
+
+# Property items, tried in order until one matches
+PROPERTY_SELECTORS = [
+    ".views-row",
+    ".view-content .node",
+    ".immeuble",
+    ".annonce-wrapper"
+]
+PROPERTY_CONTAINER_SELECTOR = ", ".join(PROPERTY_SELECTORS)
+
+# Text fields of a property, each with its candidate selectors tried in order
+FIELD_SELECTORS = {
+    "title": ["h3", ".field-content a", ".property-title", ".views-field-title"],
+    "price": [".field-name-field-prix", ".field--name-field-prix", ".prix", ".views-field-field-prix"],
+    "location": [".field-name-field-ville", ".field--name-field-ville", ".location", ".views-field-field-ville"],
+    "bedrooms": [".field-name-field-nb-pieces", ".field--name-field-nb-pieces", ".chambres", ".views-field-field-nb-pieces"],
+    "bathrooms": [".field-name-field-salles-de-bain", ".field--name-field-salles-de-bain", ".sdb"],  # not always available
+    "area": [".field-name-field-surface", ".field--name-field-surface", ".surface", ".views-field-field-surface"],
+    "property_type": [".field-name-field-type-bien", ".field--name-field-type-bien", ".type"],
+    "description": [".field-name-body", ".body", ".description"]  # may not be available on listing page
+}
+FEATURES_SELECTORS = [".field-name-field-options li", ".features li", ".options li"]
+IMAGE_SELECTORS = ["img", ".field-slideshow-image img", ".property-image img"]
+# Only links to a listing page, the CSS engine filters on the href
+LINK_SELECTORS = ['a[href*="immeubles"]', 'h3 a[href*="immeubles"]', '.field-content a[href*="immeubles"]']
+
+# Union of the candidates of each field, matching if any of them does
+SELECTOR_UNIONS = {field: ", ".join(selectors) for field, selectors in FIELD_SELECTORS.items()}
+SELECTOR_UNIONS["image_url"] = ", ".join(IMAGE_SELECTORS)
+SELECTOR_UNIONS["listing_url"] = ", ".join(LINK_SELECTORS)
+
+# Runs in the browser and extracts every property of the page in one round-trip
+EXTRACT_PROPERTIES_SCRIPT = """
+({containers, fields, features, images, links, unions, cache}) => {
+    // Try the selector that won last time first, the winner is almost always the same for the whole site
+    const candidates = (key, selectors) => cache[key] ? [cache[key], ...selectors.filter(sel => sel !== cache[key])] : selectors;
     
-    print(f"\nStarting scraping of: {url}")
-    all_properties = []
+    const selector = candidates("container", containers).find(sel => document.querySelector(sel) !== null);
+    if (!selector) {
+        return {selector: null, properties: [], cache};
+    }
+    cache.container = selector;
     
-    with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(headless=False)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
-            viewport={"width": 1280, "height": 800}
-        )
-        page = context.new_page()
+    const firstMatch = (el, key, selectors) => {
+        // One query on the union rules out fields the property doesn't have
+        if (el.querySelector(unions[key]) === null) return null;
+        for (const sel of candidates(key, selectors)) {
+            const node = el.querySelector(sel);
+            if (node) {
+                cache[key] = sel;
+                return node;
+            }
+        }
+        return null;
+    };
+    
+    const properties = Array.from(document.querySelectorAll(selector), el => {
+        const property = {};
+        for (const [field, selectors] of Object.entries(fields)) {
+            const node = firstMatch(el, field, selectors);
+            property[field] = node ? node.innerText.trim() : "";
+        }
+        
+        property.features = [];
+        for (const sel of candidates("features", features)) {
+            const items = el.querySelectorAll(sel);
+            if (items.length > 0) {
+                cache.features = sel;
+                property.features = Array.from(items, item => item.innerText.trim());
+                break;
+            }
+        }
         
+        const img = firstMatch(el, "image_url", images);
+        property.image_url = img ? (img.getAttribute("src") || img.getAttribute("data-src") || "") : "";
+        
+        const link = firstMatch(el, "listing_url", links);
+        property.listing_url = link ? link.getAttribute("href") : "";
+        return property;
+    });
+    return {selector, properties, cache};
+}
+"""
+
+# Pager links to the next page
+NEXT_PAGE_SELECTORS = [
+    ".pager-next a",
+    ".pagination a[rel='next']",
+    "a[rel='next']",
+    "a.next",
+    ".next a"
+]
+
+# Returns the absolute URL of the first next page link found
+NEXT_PAGE_HREF_SCRIPT = """
+selectors => {
+    for (const sel of selectors) {
+        const link = document.querySelector(sel);
+        if (link && link.getAttribute("href")) return link.href;
+    }
+    return null;
+}
+"""
+
+# Page parameter in the pager URLs, like '?page=1'
+PAGE_PARAMETER_PATTERN = re.compile(r'[?&]page=(\d+)')
+
+# Resource types not downloaded while scraping
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+
+# Maximum number of listing pages loaded at the same time
+MAX_PARALLEL_PAGES = 3
+
+async def block_heavy_resources(route):
+    """Route handler aborting the resources the extraction doesn't need (image URLs come from the markup)"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+def parse_properties_html(html, selector_cache):
+    """Extract the raw fields of every property from a listing page's HTML with selectolax
+    
+    Same rules as EXTRACT_PROPERTIES_SCRIPT: returns the matching container selector (or None)
+    and a list of dicts, and reads and updates selector_cache the same way.
+    """
+    tree = LexborHTMLParser(html)
+    
+    def candidates(key, selectors):
+        # Try the selector that won last time first
+        cached = selector_cache.get(key)
+        return [cached] + [sel for sel in selectors if sel != cached] if cached else selectors
+    
+    def first_match(node, key, selectors):
+        # One query on the union rules out fields the property doesn't have
+        if node.css_first(SELECTOR_UNIONS[key]) is None:
+            return None
+        for sel in candidates(key, selectors):
+            match = node.css_first(sel)
+            if match is not None:
+                selector_cache[key] = sel
+                return match
+        return None
+    
+    selector = next((sel for sel in candidates("container", PROPERTY_SELECTORS) if tree.css_first(sel) is not None), None)
+    if not selector:
+        return None, []
+    selector_cache["container"] = selector
+    
+    properties = []
+    for node in tree.css(selector):
+        extracted = {}
+        for field, selectors in FIELD_SELECTORS.items():
+            match = first_match(node, field, selectors)
+            extracted[field] = match.text(separator=" ", strip=True) if match is not None else ""
+        
+        extracted["features"] = []
+        for sel in candidates("features", FEATURES_SELECTORS):
+            items = node.css(sel)
+            if items:
+                selector_cache["features"] = sel
+                extracted["features"] = [item.text(separator=" ", strip=True) for item in items]
+                break
+        
+        # Each .attributes access builds a new dict, read it once per node
+        img = first_match(node, "image_url", IMAGE_SELECTORS)
+        img_attributes = img.attributes if img is not None else {}
+        extracted["image_url"] = img_attributes.get("src") or img_attributes.get("data-src") or ""
+        
+        link = first_match(node, "listing_url", LINK_SELECTORS)
+        extracted["listing_url"] = link.attributes.get("href") if link is not None else ""
+        
+        properties.append(extracted)
+    
+    return selector, properties
+
+async def extract_properties(page, page_number, domain, selector_cache):
+    """Extract the properties listed on a loaded Tecnocasa.tn page
+    
+    The page HTML is parsed with selectolax when it is installed, otherwise the
+    extraction runs in the browser with a single page.evaluate call.
+    
+    selector_cache maps each field to the selector that matched last time; it is tried
+    first and updated with the winners of this page.
+    """
+    if SELECTOLAX_AVAILABLE:
+        # Parse the HTML in-process instead of walking the DOM through the browser
+        selector, raw_properties = parse_properties_html(await page.content(), selector_cache)
+    else:
+        result = await page.evaluate(EXTRACT_PROPERTIES_SCRIPT, {
+            "containers": PROPERTY_SELECTORS,
+            "fields": FIELD_SELECTORS,
+            "features": FEATURES_SELECTORS,
+            "images": IMAGE_SELECTORS,
+            "links": LINK_SELECTORS,
+            "unions": SELECTOR_UNIONS,
+            "cache": selector_cache
+        })
+        selector_cache.update(result["cache"])
+        selector, raw_properties = result["selector"], result["properties"]
+    
+    return build_properties(selector, raw_properties, page_number, domain)
+
+def build_properties(selector, raw_properties, page_number, domain):
+    """Turn the raw fields extracted from a listing page into property records"""
+    properties = []
+    
+    if not selector:
+        print(f"No properties found with any selector on page {page_number}")
+        return properties
+    
+    print(f"Found {len(raw_properties)} properties with selector: {selector} on page {page_number}")
+    
+    for i, extracted in enumerate(raw_properties):
+        # If relative URL, make it absolute
+        image_url = urljoin(BASE_URL, extracted["image_url"]) if extracted["image_url"] else ""
+        listing_url = urljoin(BASE_URL, extracted["listing_url"]) if extracted["listing_url"] else ""
+        
+        # Create property data
+        property_data = {
+            "title": extracted["title"],
+            "price": extracted["price"],
+            "location": extracted["location"],
+            "bedrooms": extracted["bedrooms"],
+            "bathrooms": extracted["bathrooms"],
+            "area": extracted["area"],
+            "property_type": extracted["property_type"],
+            "description": extracted["description"],
+            "features": ", ".join(extracted["features"]),
+            "image_url": image_url,
+            "listing_url": listing_url,
+            "source_site": domain,
+            "page_number": page_number
+        }
+        
+        title, price, location = property_data["title"], property_data["price"], property_data["location"]
+        if title or price or location:  # Only add if we have some basic data
+            properties.append(property_data)
+            print(f"  Added property {i+1} of page {page_number}: {title[:30]}... | {price} | {location}")
+    
+    return properties
+
+def find_next_page_url(html, page_url):
+    """Return the absolute URL of the pager's next link in a listing page's HTML, or None"""
+    tree = LexborHTMLParser(html)
+    for sel in NEXT_PAGE_SELECTORS:
+        link = tree.css_first(sel)
+        if link is not None and link.attributes.get("href"):
+            return urljoin(page_url, link.attributes["href"])
+    return None
+
+def get_page_url_template(next_page_url):
+    """Turn the pager's link to page 2 into a URL template with a {page} placeholder
+    
+    Returns the template and the offset between the page number in the URL and the
+    page count (Drupal pagers start counting at 0), or (None, 0) without a page parameter.
+    """
+    match = PAGE_PARAMETER_PATTERN.search(next_page_url)
+    if not match:
+        return None, 0
+    
+    # Escape literal braces so only the page placeholder is formatted
+    prefix = next_page_url[:match.start(1)].replace("{", "{{").replace("}", "}}")
+    suffix = next_page_url[match.end(1):].replace("{", "{{").replace("}", "}}")
+    return prefix + "{page}" + suffix, int(match.group(1)) - 2
+
+async def process_page(context, semaphore, page_url, page_number, domain, selector_cache, output_folder, discover_pager=False):
+    """Load one listing page in its own tab and extract its properties
+    
+    With discover_pager, also read the pager's next link and return its URL template and
+    page offset (see get_page_url_template); otherwise the template is None.
+    """
+    url_template, page_offset = None, 0
+    async with semaphore:
+        page = await context.new_page()
         try:
-            # Navigate to the URL
-            print(f"Loading page...")
-            page.goto(url, timeout=60000)
-            page.wait_for_load_state("networkidle", timeout=60000)
+            print(f"Processing page {page_number}: {page_url}")
+            await page.goto(page_url, timeout=30000, wait_until="domcontentloaded")
             
-            # Wait a moment
-            time.sleep(3)
+            # The page is ready as soon as the first property item is in the DOM
+            try:
+                await page.wait_for_selector(PROPERTY_CONTAINER_SELECTOR, timeout=15000, state="attached")
+            except PlaywrightTimeoutError:
+                print(f"No property item appeared on page {page_number}")
             
-            # Take a screenshot for debugging
-            screenshot_file = f"{domain}_homepage.png"
-            page.screenshot(path=os.path.join(OUTPUT_FOLDER, screenshot_file))
-            print(f"Saved screenshot to {screenshot_file}")
+            # Take a screenshot of the first page for debugging
+            if DEBUG and page_number == 1:
+                screenshot_file = f"{domain}_homepage.png"
+                await page.screenshot(path=output_folder / screenshot_file)
+                print(f"Saved screenshot to {screenshot_file}")
             
-            # Scroll down to load lazy content
-            print("Scrolling to load more content...")
-            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            time.sleep(2)
+            if discover_pager:
+                next_page_url = await page.evaluate(NEXT_PAGE_HREF_SCRIPT, NEXT_PAGE_SELECTORS)
+                if next_page_url:
+                    url_template, page_offset = get_page_url_template(next_page_url)
+                    print(f"Found next page link: {next_page_url}")
+                else:
+                    print("No next page link found, the listing has a single page")
             
-            page_count = 1
-            max_pages = 5
+            return await extract_properties(page, page_number, domain, selector_cache), url_template, page_offset
+        except Exception as e:
+            print(f"Error scraping page {page_number} of {domain}: {str(e)}")
+            # Keep a screenshot of failing pages for diagnostics
+            try:
+                screenshot_file = f"{domain}_error_page{page_number}.png"
+                await page.screenshot(path=output_folder / screenshot_file)
+                print(f"Saved error screenshot to {screenshot_file}")
+            except Exception:
+                pass
+            return [], url_template, page_offset
+        finally:
+            await page.close()
+
+def dump_json_line(prop):
+    """Serialize a property as one UTF-8 encoded NDJSON line"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(prop) + b"\n"
+    return (json.dumps(prop, ensure_ascii=False) + "\n").encode("utf-8")
+
+def keep_new_properties(page_properties, seen):
+    """Drop the properties already collected, pagers often repeat a row on the next page
+    
+    seen holds the (title, price, listing_url) key of every property kept so far.
+    """
+    new_properties = []
+    for prop in page_properties:
+        key = (prop["title"], prop["price"], prop["listing_url"])
+        if key in seen:
+            continue
+        seen.add(key)
+        new_properties.append(prop)
+    return new_properties
+
+def append_page_results(page_properties, csv_writer, ndjson_file):
+    """Append the properties of one page to the streamed CSV and NDJSON files"""
+    csv_writer.writerows(page_properties)
+    ndjson_file.writelines(dump_json_line(prop) for prop in page_properties)
+    print(f"Saved {len(page_properties)} properties of page {page_properties[0]['page_number']} to intermediate files")
+
+async def fetch_page_properties(client, page_url, page_number, domain, selector_cache):
+    """Fetch one listing page over plain HTTP and extract its properties
+    
+    Returns the properties and the page HTML.
+    """
+    print(f"Fetching page {page_number}: {page_url}")
+    response = await client.get(page_url)
+    response.raise_for_status()
+    selector, raw_properties = parse_properties_html(response.text, selector_cache)
+    return build_properties(selector, raw_properties, page_number, domain), response.text
+
+async def scrape_pages_http(url, domain, max_pages, selector_cache, collect):
+    """Scrape the listing pages with plain HTTP requests, without a browser
+    
+    Tecnocasa's listings are server-rendered, so the HTML is enough. Returns False when
+    the first page can't be fetched or has no properties in its HTML, so the caller can
+    fall back to the browser.
+    """
+    async with httpx.AsyncClient(headers={"User-Agent": USER_AGENT}, timeout=20, follow_redirects=True) as client:
+        try:
+            page_properties, html = await fetch_page_properties(client, url, 1, domain, selector_cache)
+        except httpx.HTTPError as e:
+            print(f"Error fetching page 1 of {domain}: {str(e)}")
+            return False
+        
+        if not page_properties:
+            print("No properties in the served HTML, falling back to the browser")
+            return False
+        collect(page_properties)
+        
+        # The first page also tells us how the pager builds its URLs
+        next_page_url = find_next_page_url(html, url)
+        url_template, page_offset = get_page_url_template(next_page_url) if next_page_url else (None, 0)
+        if not url_template:
+            print("No next page link found, the listing has a single page")
+            return True
+        print(f"Found next page link: {next_page_url}")
+        
+        # The other pages are fetched all at once
+        page_numbers = range(2, max_pages + 1)
+        results = await asyncio.gather(*[
+            fetch_page_properties(client, url_template.format(page=page_number + page_offset),
+                                  page_number, domain, selector_cache)
+            for page_number in page_numbers
+        ], return_exceptions=True)
+        
+        for page_number, result in zip(page_numbers, results):
+            if isinstance(result, Exception):
+                print(f"Error fetching page {page_number} of {domain}: {str(result)}")
+                continue
+            collect(result[0])
+    
+    return True
+
+async def scrape_pages_browser(url, domain, max_pages, selector_cache, output_folder, collect):
+    """Scrape the listing pages concurrently in one browser context"""
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(
+            headless=True,
+            args=["--disable-gpu", "--no-sandbox", "--disable-dev-shm-usage"]
+        )
+        try:
+            # A single context is shared by all page tasks
+            context = await browser.new_context(
+                user_agent=USER_AGENT,
+                viewport={"width": 1280, "height": 800}
+            )
+            await context.route("**/*", block_heavy_resources)
             
-            # Process each page
-            while page_count <= max_pages:
-                print(f"Processing page {page_count}...")
-                
-                # Take a screenshot for debugging
-                screenshot_file = f"{domain}_page{page_count}.png"
-                page.screenshot(path=os.path.join(OUTPUT_FOLDER, screenshot_file))
-                print(f"Saved screenshot to {screenshot_file}")
-                
-                # Get property items
-                property_selectors = [
-                    ".views-row",
-                    ".view-content .node", 
-                    ".immeuble",
-                    ".annonce-wrapper"
-                ]
-                
-                # Try each selector
-                property_locator = None
-                for selector in property_selectors:
-                    count = page.locator(selector).count()
-                    if count > 0:
-                        print(f"Found {count} properties with selector: {selector}")
-                        property_locator = page.locator(selector)
-                        break
-                
-                if not property_locator:
-                    print("No properties found with any selector")
-                    break
-                
-                # Process each property
-                property_count = property_locator.count()
-                for i in range(property_count):
-                    try:
-                        # Select current property
-                        current_property = property_locator.nth(i)
-                        
-                        # Extract data
-                        # Title
-                        title = ""
-                        for title_selector in ["h3", ".field-content a", ".property-title", ".views-field-title"]:
-                            if current_property.locator(title_selector).count() > 0:
-                                title = current_property.locator(title_selector).first.inner_text().strip()
-                                break
-                        
-                        # Price
-                        price = ""
-                        for price_selector in [".field-name-field-prix", ".field--name-field-prix", ".prix", ".views-field-field-prix"]:
-                            if current_property.locator(price_selector).count() > 0:
-                                price = current_property.locator(price_selector).first.inner_text().strip()
-                                break
-                        
-                        # Location
-                        location = ""
-                        for location_selector in [".field-name-field-ville", ".field--name-field-ville", ".location", ".views-field-field-ville"]:
-                            if current_property.locator(location_selector).count() > 0:
-                                location = current_property.locator(location_selector).first.inner_text().strip()
-                                break
-                        
-                        # Bedrooms
-                        bedrooms = ""
-                        for bedrooms_selector in [".field-name-field-nb-pieces", ".field--name-field-nb-pieces", ".chambres", ".views-field-field-nb-pieces"]:
-                            if current_property.locator(bedrooms_selector).count() > 0:
-                                bedrooms = current_property.locator(bedrooms_selector).first.inner_text().strip()
-                                break
-                        
-                        # Bathrooms - not always available
-                        bathrooms = ""
-                        for bathrooms_selector in [".field-name-field-salles-de-bain", ".field--name-field-salles-de-bain", ".sdb"]:
-                            if current_property.locator(bathrooms_selector).count() > 0:
-                                bathrooms = current_property.locator(bathrooms_selector).first.inner_text().strip()
-                                break
-                        
-                        # Area
-                        area = ""
-                        for area_selector in [".field-name-field-surface", ".field--name-field-surface", ".surface", ".views-field-field-surface"]:
-                            if current_property.locator(area_selector).count() > 0:
-                                area = current_property.locator(area_selector).first.inner_text().strip()
-                                break
-                        
-                        # Property type
-                        property_type = ""
-                        for type_selector in [".field-name-field-type-bien", ".field--name-field-type-bien", ".type"]:
-                            if current_property.locator(type_selector).count() > 0:
-                                property_type = current_property.locator(type_selector).first.inner_text().strip()
-                                break
-                        
-                        # Description - may not be available on listing page
-                        description = ""
-                        for desc_selector in [".field-name-body", ".body", ".description"]:
-                            if current_property.locator(desc_selector).count() > 0:
-                                description = current_property.locator(desc_selector).first.inner_text().strip()
-                                break
-                        
-                        # Features
-                        features = []
-                        for features_selector in [".field-name-field-options li", ".features li", ".options li"]:
-                            feature_count = current_property.locator(features_selector).count()
-                            if feature_count > 0:
-                                for j in range(feature_count):
-                                    feature = current_property.locator(features_selector).nth(j).inner_text().strip()
-                                    features.append(feature)
-                                break
-                        
-                        # Image URL
-                        image_url = ""
-                        for image_selector in ["img", ".field-slideshow-image img", ".property-image img"]:
-                            if current_property.locator(image_selector).count() > 0:
-                                img_element = current_property.locator(image_selector).first
-                                image_url = img_element.get_attribute("src") or img_element.get_attribute("data-src") or ""
-                                
-                                # If relative URL, make it absolute
-                                if image_url and not image_url.startswith(("http://", "https://")):
-                                    base_url = f"https://{domain}"
-                                    image_url = f"{base_url}{image_url if image_url.startswith('/') else '/' + image_url}"
-                                break
-                        
-                        # Listing URL
-                        listing_url = ""
-                        for url_selector in ["a", "h3 a", ".field-content a"]:
-                            if current_property.locator(url_selector).count() > 0:
-                                for j in range(current_property.locator(url_selector).count()):
-                                    link_element = current_property.locator(url_selector).nth(j)
-                                    href = link_element.get_attribute("href") or ""
-                                    if href and "immeubles" in href:
-                                        listing_url = href
-                                        if not listing_url.startswith(("http://", "https://")):
-                                            base_url = f"https://{domain}"
-                                            listing_url = f"{base_url}{listing_url if listing_url.startswith('/') else '/' + listing_url}"
-                                        break
-                                if listing_url:  # Break outer loop if we found a URL
-                                    break
-                        
-                        # Create property data
-                        property_data = {
-                            "title": title,
-                            "price": price,
-                            "location": location,
-                            "bedrooms": bedrooms,
-                            "bathrooms": bathrooms,
-                            "area": area,
-                            "property_type": property_type,
-                            "description": description,
-                            "features": ", ".join(features),
-                            "image_url": image_url,
-                            "listing_url": listing_url,
-                            "source_site": domain,
-                            "page_number": page_count
-                        }
-                        
-                        if title or price or location:  # Only add if we have some basic data
-                            all_properties.append(property_data)
-                            print(f"  Added property {i+1}: {title[:30]}... | {price} | {location}")
-                        
-                    except Exception as e:
-                        print(f"Error processing property {i+1}: {str(e)}")
-                
-                # Save data after each page to avoid losing progress
-                if all_properties:
-                    intermediate_csv = os.path.join(OUTPUT_FOLDER, f"{domain}_{TIMESTAMP}_page{page_count}.csv")
-                    intermediate_json = os.path.join(OUTPUT_FOLDER, f"{domain}_{TIMESTAMP}_page{page_count}.json")
-                    
-                    save_to_csv(all_properties, intermediate_csv)
-                    save_to_json(all_properties, intermediate_json)
-                    print(f"Saved {len(all_properties)} properties to intermediate files")
-                
-                # Check if there's a next page
-                if page_count < max_pages:
-                    # Different next page selectors
-                    next_page_selectors = [
-                        ".pager-next a", 
-                        ".pagination a[rel='next']", 
-                        "a:text('Suivant')",
-                        "a:text('page suivante')",
-                        "a.next",
-                        ".next a"
-                    ]
-                    
-                    next_clicked = False
-                    for selector in next_page_selectors:
-                        try:
-                            if page.locator(selector).count() > 0 and page.locator(selector).first.is_visible():
-                                print(f"Found next page button with selector: {selector}")
-                                
-                                # Take screenshot before clicking
-                                page.screenshot(path=os.path.join(OUTPUT_FOLDER, f"{domain}_before_next_page{page_count}.png"))
-                                
-                                page.locator(selector).first.click()
-                                next_clicked = True
-                                page_count += 1
-                                
-                                # Wait for page to load
-                                page.wait_for_load_state("networkidle", timeout=30000)
-                                
-                                # Scroll down to load lazy content
-                                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                                time.sleep(3)
-                                break
-                        except Exception as e:
-                            print(f"Error clicking next page with selector '{selector}': {str(e)}")
-                    
-                    if not next_clicked:
-                        print("No next page button found. Ending pagination.")
-                        break
-                else:
-                    print(f"Reached maximum page limit ({max_pages}). Stopping pagination.")
-                    break
+            semaphore = asyncio.Semaphore(MAX_PARALLEL_PAGES)
             
-            print(f"Completed scraping of {domain}. Total properties: {len(all_properties)}")
+            # The first page also tells us how the pager builds its URLs
+            page_properties, url_template, page_offset = await process_page(
+                context, semaphore, url, 1, domain, selector_cache, output_folder, discover_pager=True
+            )
+            collect(page_properties)
             
+            # The other pages are independent, so load up to MAX_PARALLEL_PAGES of them at the same time
+            if url_template:
+                tasks = [
+                    asyncio.create_task(process_page(
+                        context, semaphore, url_template.format(page=page_number + page_offset),
+                        page_number, domain, selector_cache, output_folder
+                    ))
+                    for page_number in range(2, max_pages + 1)
+                ]
+                
+                for task in asyncio.as_completed(tasks):
+                    page_properties, _, _ = await task
+                    collect(page_properties)
+        
         except Exception as e:
             print(f"Error scraping {domain}: {str(e)}")
         finally:
-            browser.close()
+            await browser.close()
+
+async def _scrape_tecnocasa_async(output_folder, timestamp):
+    """Scrape the Tecnocasa.tn listing pages, over plain HTTP when possible, else in a browser"""
+    url = "https://www.tecnocasa.tn/vendre/immeubles/nord-est-ne/cap-bon/kelibia.html"
+    domain = "tecnocasa.tn"
+    max_pages = 5
+    
+    print(f"\nStarting scraping of: {url}")
+    all_properties = []
+    # Keys of the properties collected so far, to skip duplicates across pages
+    seen = set()
+    # Winning selector per field, shared by all pages
+    selector_cache = {}
+    
+    # Only the new rows of each page are written, as soon as the page is done, to avoid losing progress
+    intermediate_csv = output_folder / f"{domain}_{timestamp}_intermediate.csv"
+    intermediate_ndjson = output_folder / f"{domain}_{timestamp}_intermediate.ndjson"
+    csv_is_new = not intermediate_csv.exists()
+    
+    with open(intermediate_csv, "a", newline="", encoding="utf-8") as csv_file, \
+            open(intermediate_ndjson, "ab") as ndjson_file:
+        csv_writer = csv.DictWriter(csv_file, fieldnames=FIELDNAMES, extrasaction="ignore", restval="")
+        if csv_is_new:
+            csv_writer.writeheader()
+        
+        def collect(page_properties):
+            page_properties = keep_new_properties(page_properties, seen)
+            all_properties.extend(page_properties)
+            if page_properties:
+                append_page_results(page_properties, csv_writer, ndjson_file)
+        
+        # Plain HTTP needs selectolax to parse the pages; the browser stays the fallback
+        scraped = False
+        if HTTPX_AVAILABLE and SELECTOLAX_AVAILABLE:
+            scraped = await scrape_pages_http(url, domain, max_pages, selector_cache, collect)
+        if not scraped:
+            await scrape_pages_browser(url, domain, max_pages, selector_cache, output_folder, collect)
+    
+    # Pages finish in any order, restore the listing order
+    all_properties.sort(key=lambda prop: prop["page_number"])
+    print(f"Completed scraping of {domain}. Total properties: {len(all_properties)}")
     
     return all_properties
 
+def scrape_tecnocasa(output_folder, timestamp):
+    """Scrape Tecnocasa.tn, writing the run's files to output_folder (a Path)"""
+    return asyncio.run(_scrape_tecnocasa_async(output_folder, timestamp))
+
 def save_to_csv(data, filename):
     """Save the scraped data to a CSV file"""
     with open(filename, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=FIELDNAMES)
+        # Missing fields are written empty and extra keys are ignored
+        writer = csv.DictWriter(file, fieldnames=FIELDNAMES, extrasaction="ignore", restval="")
         writer.writeheader()
-        
-        for prop in data:
-            # Create a row with all possible fields
-            row = {field: "" for field in FIELDNAMES}
-            
-            # Update with available data
-            for key, value in prop.items():
-                if key in FIELDNAMES:
-                    row[key] = value
-                    
-            writer.writerow(row)
+        writer.writerows(data)
     
     print(f"Data saved to: {filename}")
 
 def save_to_json(data, filename):
     """Save the scraped data to a JSON file"""
-    with open(filename, "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=4, ensure_ascii=False)
+    if ORJSON_AVAILABLE:
+        with open(filename, "wb") as file:
+            file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=2, ensure_ascii=False)
     
     print(f"Data saved to: {filename}")
 
 def main():
     """Main function to scrape Tecnocasa.tn"""
-    print(f"Starting scraper at {TIMESTAMP}")
+    # Generate timestamp for this run
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    output_folder = Path(OUTPUT_FOLDER)
+    output_folder.mkdir(exist_ok=True)
+    
+    print(f"Starting scraper at {timestamp}")
     
     # Scrape the site
-    all_properties = scrape_tecnocasa()
+    all_properties = scrape_tecnocasa(output_folder, timestamp)
     
     # Save final results
     if all_properties:
-        csv_filename = os.path.join(OUTPUT_FOLDER, f"tecnocasa.tn_{TIMESTAMP}_full.csv")
-        json_filename = os.path.join(OUTPUT_FOLDER, f"tecnocasa.tn_{TIMESTAMP}_full.json")
+        csv_filename = output_folder / f"tecnocasa.tn_{timestamp}_full.csv"
+        json_filename = output_folder / f"tecnocasa.tn_{timestamp}_full.json"
         
         save_to_csv(all_properties, csv_filename)
         save_to_json(all_properties, json_filename)
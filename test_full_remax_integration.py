@@ -14,8 +14,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger("FullIntegrationTest")
 
-def test_remax_full_integration():
-    """Test the full Remax integration by running the main scraper with just Remax enabled"""
+def test_remax_full_integration(browser):
+    """Test the full Remax integration by running the main scraper with just Remax enabled
+    
+    browser is the shared session browser from conftest.py, or None to launch one.
+    """
     # Backup original SITE_CONFIGS
     from tunisian_property_scraper import SITE_CONFIGS as ORIGINAL_CONFIGS
     
@@ -35,13 +38,13 @@ def test_remax_full_integration():
     
     # Run the main function
     logger.info("Starting test with only Remax.com.tn")
-    tunisian_property_scraper.main()
+    tunisian_property_scraper.main(browser)
     
     logger.info("Test completed successfully")
     
 if __name__ == "__main__":
     try:
-        test_remax_full_integration()
+        test_remax_full_integration(None)
     except Exception as e:
         logger.error(f"Error during test: {e}")
         import traceback
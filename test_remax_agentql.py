@@ -48,8 +48,11 @@ except ImportError:
     logger.error("remax_hash_pagination.py not found in the current directory.")
     sys.exit(1)
 
-def test_remax_agentql_vs_hash():
-    """Compare AgentQL-based pagination with our hash-based URL approach"""
+def test_remax_agentql_vs_hash(browser):
+    """Compare AgentQL-based pagination with our hash-based URL approach
+    
+    browser is the shared session browser from conftest.py, or None to launch one.
+    """
     logger.info("Testing Remax.com.tn pagination methods...")
     
     base_url = "https://www.remax.com.tn/PublicListingList.aspx"
@@ -88,7 +91,8 @@ def test_remax_agentql_vs_hash():
         # Run the test scrape with only 2 pages maximum
         try:
             start_time = time.time()
-            properties = scrape_remax_with_agentql(base_url, max_pages=2, output_callback=log_callback)
+            properties = scrape_remax_with_agentql(base_url, max_pages=2, output_callback=log_callback,
+                                                   browser=browser)
             end_time = time.time()
             
             f.write(f"\nTotal properties found: {len(properties)}\n")
@@ -114,7 +118,7 @@ def test_remax_agentql_vs_hash():
     return output_file
 
 if __name__ == "__main__":
-    result_file = test_remax_agentql_vs_hash()
+    result_file = test_remax_agentql_vs_hash(None)
     print(f"Test completed. Results available in {result_file}")
     
     # Print a summary of the results
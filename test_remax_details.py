@@ -5,10 +5,30 @@ Test script for Remax property detail pages
 import os
 import json
 import time
+import asyncio
+import hashlib
+import re
 import logging
-from playwright.sync_api import sync_playwright
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from datetime import datetime
 
+# orjson is optional: without it the standard json module is used
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# httpx and selectolax are optional: without them every detail page is loaded in the browser
+try:
+    import httpx
+    from selectolax.lexbor import LexborHTMLParser
+    HTTP_FETCH_AVAILABLE = True
+except ImportError:
+    HTTP_FETCH_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -16,18 +36,358 @@ logging.basicConfig(
 )
 logger = logging.getLogger("RemaxDetailTest")
 
+# Screenshots are only taken with REMAX_DEBUG=1
+DEBUG = os.environ.get("REMAX_DEBUG") == "1"
+
+# The detail cache on disk is opt-in with REMAX_DETAILS_CACHE=1, so a normal run always scrapes
+USE_DETAILS_CACHE = os.environ.get("REMAX_DETAILS_CACHE") == "1"
+
+# Maximum number of detail pages loaded at the same time
+MAX_PARALLEL_PAGES = 8
+
+# The detail page has rendered once any of these is in the DOM
+DETAIL_READY_SELECTOR = "h1, .price-main, .price-container"
+
+# Runs in the browser and extracts all the fields of a detail page in one round-trip
+EXTRACT_DETAILS_SCRIPT = """() => {
+    const text = selector => {
+        const element = document.querySelector(selector);
+        return element ? element.textContent.trim() : null;
+    };
+    
+    // Label and value of each row of the property details section
+    const details = [];
+    const detailsSection = document.querySelector(".property-details, .property-features");
+    if (detailsSection) {
+        for (const item of detailsSection.querySelectorAll(".detail-item, .feature-item, .row")) {
+            const label = item.querySelector(".detail-label, .feature-label, .label");
+            const value = item.querySelector(".detail-value, .feature-value, .value");
+            if (label && value) {
+                details.push([label.textContent.trim(), value.textContent.trim()]);
+            }
+        }
+    }
+    
+    let structuredData = null;
+    const jsonLd = document.querySelector('script[type="application/ld+json"]');
+    if (jsonLd) {
+        try {
+            structuredData = JSON.parse(jsonLd.textContent);
+        } catch (e) {
+            structuredData = null;
+        }
+    }
+    
+    const galleryImages = document.querySelectorAll(".property-gallery img, .gallery img");
+    
+    return {
+        title: text("h1, .property-title, h3.title"),
+        price: text(".price-main, .main-price, .price-container"),
+        details: details,
+        structured_data: structuredData,
+        sections: {
+            description: text(".property-description, .description"),
+            features: text(".property-features, .features"),
+            location: text(".property-location, .location")
+        },
+        images: galleryImages.length > 0
+            ? Array.from(galleryImages, img => img.getAttribute("src")).filter(src => src)
+            : null
+    };
+}"""
+
+# Detail page URLs, like /fr-tn/biens/appartement/vente/le-bardo/1048044004-13
+PROPERTY_URL_PATTERN = re.compile(r"/biens/(?P<ptype>[^/]+)/(?:.*/)?(?P<pid>\d+)-\d+/?$")
+
+# Detail row labels and the field their value also goes to, the first matching label wins
+DETAIL_LABEL_FIELDS = [
+    (re.compile(r"surface|area"), "area"),
+    (re.compile(r"chambres|bedrooms"), "bedrooms"),
+    (re.compile(r"salles de bain|bathrooms"), "bathrooms"),
+    (re.compile(r"terrain|land"), "land_area")
+]
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
+
+# With the cache enabled, detail pages scraped less than this many seconds ago are read back from it
+CACHE_MAX_AGE = 3600
+
+# Requests not needed for the test (image URLs are read from the markup, not downloaded)
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+BLOCKED_HOSTS = ("google-analytics.com", "googletagmanager.com", "facebook.net", "doubleclick.net")
+
+class PagePool:
+    """Pages of one browser context, reused from URL to URL instead of opened per URL"""
+    
+    def __init__(self, context):
+        self.context = context
+        self.pages = asyncio.Queue()
+    
+    async def open(self, size):
+        """Create the pool's pages"""
+        for _ in range(size):
+            self.pages.put_nowait(await self.context.new_page())
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow a page, waiting for one to be free"""
+        page = await self.pages.get()
+        try:
+            yield page
+        finally:
+            # Cancel what the page is still loading before it goes back to the pool
+            try:
+                await page.evaluate("() => window.stop()")
+            except Exception:
+                pass
+            self.pages.put_nowait(page)
+
+async def block_unneeded_resources(route):
+    """Route handler aborting images, fonts, styles, media and analytics requests"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+def dump_json(data):
+    """Serialize data as indented UTF-8 encoded JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
 def save_to_json(data, output_file):
     """Save data to JSON file"""
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with open(output_file, 'wb') as f:
+        f.write(dump_json(data))
+    logger.debug("Saved data to %s", output_file)
+
+def save_to_jsonl(items, output_file):
+    """Save a list to a JSON Lines file, one item per line, so it can be written and read as a stream"""
+    with open(output_file, 'wb') as f:
+        for item in items:
+            if ORJSON_AVAILABLE:
+                f.write(orjson.dumps(item, option=orjson.OPT_NON_STR_KEYS))
+            else:
+                f.write(json.dumps(item, ensure_ascii=False).encode('utf-8'))
+            f.write(b"\n")
     logger.info(f"Saved data to {output_file}")
 
-def test_remax_property_details():
-    """Test extracting details directly from property detail pages"""
+_client = None
+
+def get_client():
+    """Return the HTTP client shared by every request to remax.com.tn, creating it on first use
+    
+    Its connections are kept alive between requests. The client belongs to the running
+    event loop, so close_client() must be awaited before that loop ends.
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=10,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+        )
+    return _client
+
+async def close_client():
+    """Close the shared HTTP client, if it was created"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+def build_property_data(url, extracted):
+    """Build a property's details from its URL and the fields extracted from its page"""
+    property_data = {
+        "source_site": "remax.com.tn",
+        "property_url": url
+    }
+    
+    # Extract property ID and type from URL
+    match = PROPERTY_URL_PATTERN.search(url)
+    if match:
+        property_data["property_id"] = match.group("pid")
+        property_data["property_type"] = match.group("ptype").replace("-", " ").title()
+    
+    if extracted["title"] is not None:
+        property_data["title"] = extracted["title"]
+    if extracted["price"] is not None:
+        property_data["price"] = extracted["price"]
+    
+    # Method 1: Specific detail rows of the property details section
+    for label, value in extracted["details"]:
+        label = label.lower()
+        property_data[f"detail_{label}"] = value
+        
+        field = next((field for pattern, field in DETAIL_LABEL_FIELDS if pattern.search(label)), None)
+        if field:
+            property_data[field] = value
+    
+    # Method 2: Structured data
+    if extracted["structured_data"]:
+        property_data["structured_data"] = extracted["structured_data"]
+    
+    # Method 3: Text content of key sections
+    for key, text in extracted["sections"].items():
+        if text is not None:
+            property_data[key] = text
+    
+    # Method 4: Image galleries
+    if extracted["images"] is not None:
+        property_data["images"] = extracted["images"]
+    
+    return property_data
+
+def parse_details_html(html):
+    """Extract the fields of a detail page from its HTML with selectolax, like EXTRACT_DETAILS_SCRIPT"""
+    tree = LexborHTMLParser(html)
+    
+    def text(selector):
+        node = tree.css_first(selector)
+        return node.text().strip() if node is not None else None
+    
+    # Label and value of each row of the property details section
+    details = []
+    details_section = tree.css_first(".property-details, .property-features")
+    if details_section is not None:
+        for item in details_section.css(".detail-item, .feature-item, .row"):
+            label = item.css_first(".detail-label, .feature-label, .label")
+            value = item.css_first(".detail-value, .feature-value, .value")
+            if label is not None and value is not None:
+                details.append([label.text().strip(), value.text().strip()])
+    
+    structured_data = None
+    json_ld = tree.css_first('script[type="application/ld+json"]')
+    if json_ld is not None:
+        try:
+            structured_data = json.loads(json_ld.text())
+        except ValueError:
+            structured_data = None
+    
+    images = None
+    gallery_images = tree.css(".property-gallery img, .gallery img")
+    if gallery_images:
+        images = []
+        for img in gallery_images:
+            src = img.attributes.get("src")
+            if src:
+                images.append(src)
+    
+    return {
+        "title": text("h1, .property-title, h3.title"),
+        "price": text(".price-main, .main-price, .price-container"),
+        "details": details,
+        "structured_data": structured_data,
+        "sections": {
+            "description": text(".property-description, .description"),
+            "features": text(".property-features, .features"),
+            "location": text(".property-location, .location")
+        },
+        "images": images
+    }
+
+async def fetch_property_details(client, url, index, total):
+    """Fetch a property detail page over plain HTTP and extract its details
+    
+    Returns None when the request fails or the served HTML has neither title nor price
+    (the page is rendered by JavaScript), so the page is loaded in the browser instead.
+    """
+    logger.debug("Fetching property URL %d/%d: %s", index, total, url)
+    try:
+        response = await client.get(url)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.warning(f"Could not fetch {url} over HTTP: {e}")
+        return None
+    
+    extracted = parse_details_html(response.text)
+    if extracted["title"] is None and extracted["price"] is None:
+        logger.debug("No title or price in the HTML of %s, it needs the browser", url)
+        return None
+    return build_property_data(url, extracted)
+
+async def scrape_property_details(pool, url, index, total, output_dir, timestamp):
+    """Load one property detail page in a pooled tab and extract its details"""
+    async with pool.acquire() as page:
+        logger.debug("Processing property URL %d/%d: %s", index, total, url)
+        
+        try:
+            # Navigate to the property page
+            await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+            
+            # Wait for the dynamic content itself rather than a fixed delay
+            try:
+                await page.wait_for_selector(DETAIL_READY_SELECTOR, state="attached", timeout=8000)
+            except PlaywrightTimeoutError:
+                logger.warning(f"No title or price appeared on {url}")
+            
+            # Save screenshot for debugging
+            if DEBUG:
+                screenshot_path = os.path.join(output_dir, f"property_{index}_{timestamp}.jpg")
+                await page.screenshot(path=screenshot_path, type="jpeg", quality=60, full_page=False)
+                logger.debug("Saved screenshot to %s", screenshot_path)
+            
+            # All the page's fields come back from a single evaluate call
+            return build_property_data(url, await page.evaluate(EXTRACT_DETAILS_SCRIPT))
+        
+        except Exception as e:
+            logger.error(f"Error processing URL {url}: {e}")
+            return None
+
+def get_cache_path(output_dir, url):
+    """Path of the cache file holding a property URL's details"""
+    return os.path.join(output_dir, ".cache", f"{hashlib.md5(url.encode()).hexdigest()}.json")
+
+def load_cached_details(cache_path):
+    """Return the cached details of a property, or None if missing or older than CACHE_MAX_AGE"""
+    try:
+        if time.time() - os.path.getmtime(cache_path) < CACHE_MAX_AGE:
+            with open(cache_path, 'rb') as f:
+                return json.loads(f.read())
+    except (OSError, ValueError):
+        pass
+    return None
+
+def save_cached_details(property_data, cache_path):
+    """Write a property's details to its cache file"""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, 'wb') as f:
+        f.write(dump_json(property_data))
+
+async def scrape_in_browser(urls, output_dir, timestamp):
+    """Load the given (index, url) detail pages concurrently in one browser
+    
+    Returns a dict of the extracted details by URL, for the pages that could be scraped.
+    """
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(bypass_csp=True, viewport={"width": 800, "height": 600})
+        await context.route("**/*", block_unneeded_resources)
+        
+        # The pool size bounds how many pages load at the same time
+        pool = PagePool(context)
+        await pool.open(min(MAX_PARALLEL_PAGES, len(urls)))
+        
+        # The pages only wait on the network, so load them all at once
+        results = await asyncio.gather(*(
+            scrape_property_details(pool, url, index, total, output_dir, timestamp)
+            for index, total, url in urls
+        ))
+        
+        await browser.close()
+    
+    return {url: property_data for (_, _, url), property_data in zip(urls, results) if property_data is not None}
+
+async def _test_remax_property_details_async():
+    """Get the details of all the property pages, from the opt-in cache, over HTTP or in the browser"""
     test_urls = [
         "https://www.remax.com.tn/fr-tn/biens/appartement/vente/le-bardo/1048044004-13",
         "https://www.remax.com.tn/fr-tn/biens/lot-de-terrains/vente/hammamet-sud/8057/1048042026-4"
     ]
+    # Drop repeated URLs, keeping the first occurrence
+    test_urls = list(dict.fromkeys(test_urls))
     
     # Create output directory
     output_dir = "test_data/remax_details"
@@ -36,132 +396,70 @@ def test_remax_property_details():
     # Generate timestamp for filenames
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
-        all_properties = []
-        
+    # Background threads writing the per-property files, so the event loop goes on with the other pages
+    writer = ThreadPoolExecutor(max_workers=2)
+    
+    # With the cache enabled, details of fresh cache entries are read back instead of scraped
+    details = {}
+    if USE_DETAILS_CACHE:
         for i, url in enumerate(test_urls):
-            logger.info(f"Processing property URL {i+1}/{len(test_urls)}: {url}")
+            property_data = load_cached_details(get_cache_path(output_dir, url))
+            if property_data is not None:
+                logger.debug("Using cached details for property URL %d/%d: %s", i + 1, len(test_urls), url)
+                details[url] = property_data
+    to_scrape = [(i + 1, len(test_urls), url) for i, url in enumerate(test_urls) if url not in details]
+    
+    # Server-rendered pages only need a plain HTTP request
+    if to_scrape and HTTP_FETCH_AVAILABLE:
+        client = get_client()
+        results = await asyncio.gather(*(
+            fetch_property_details(client, url, index, total) for index, total, url in to_scrape
+        ))
+        fetched = {url: property_data for (_, _, url), property_data in zip(to_scrape, results) if property_data is not None}
+        if USE_DETAILS_CACHE:
+            for url, property_data in fetched.items():
+                writer.submit(save_cached_details, property_data, get_cache_path(output_dir, url))
+        details.update(fetched)
+        to_scrape = [item for item in to_scrape if item[2] not in fetched]
+    
+    # The browser is only launched for the pages still missing
+    if to_scrape:
+        scraped = await scrape_in_browser(to_scrape, output_dir, timestamp)
+        if USE_DETAILS_CACHE:
+            for url, property_data in scraped.items():
+                writer.submit(save_cached_details, property_data, get_cache_path(output_dir, url))
+        details.update(scraped)
+    
+    # Keep the successful pages, in the order of test_urls
+    all_properties = []
+    for i, url in enumerate(test_urls):
+        if url in details:
+            all_properties.append(details[url])
             
-            try:
-                # Navigate to the property page
-                page.goto(url, wait_until="domcontentloaded")
-                time.sleep(3)  # Wait for dynamic content
-                
-                # Save screenshot for debugging
-                screenshot_path = os.path.join(output_dir, f"property_{i+1}_{timestamp}.png")
-                page.screenshot(path=screenshot_path)
-                logger.info(f"Saved screenshot to {screenshot_path}")
-                
-                # Extract property data
-                property_data = {
-                    "source_site": "remax.com.tn",
-                    "property_url": url
-                }
-                
-                # Extract property ID from URL
-                url_parts = url.split("/")
-                if url_parts:
-                    id_part = url_parts[-1]
-                    if "-" in id_part:
-                        property_data["property_id"] = id_part.split("-")[0]
-                    
-                    # Extract property type from URL
-                    if len(url_parts) > 4:
-                        property_data["property_type"] = url_parts[4].replace("-", " ").title()
-                
-                # Title
-                title_selector = page.query_selector("h1, .property-title, h3.title")
-                if title_selector:
-                    property_data["title"] = title_selector.text_content().strip()
-                
-                # Price
-                price_selector = page.query_selector(".price-main, .main-price, .price-container")
-                if price_selector:
-                    property_data["price"] = price_selector.text_content().strip()
-                
-                # Features from property details section
-                details_section = page.query_selector(".property-details, .property-features")
-                if details_section:
-                    # Method 1: Look for specific detail rows
-                    detail_items = details_section.query_selector_all(".detail-item, .feature-item, .row")
-                    
-                    for item in detail_items:
-                        label_element = item.query_selector(".detail-label, .feature-label, .label")
-                        value_element = item.query_selector(".detail-value, .feature-value, .value")
-                        
-                        if label_element and value_element:
-                            label = label_element.text_content().strip().lower()
-                            value = value_element.text_content().strip()
-                            
-                            property_data[f"detail_{label}"] = value
-                            
-                            if "surface" in label or "area" in label:
-                                property_data["area"] = value
-                            elif "chambres" in label or "bedrooms" in label:
-                                property_data["bedrooms"] = value
-                            elif "salles de bain" in label or "bathrooms" in label:
-                                property_data["bathrooms"] = value
-                            elif "terrain" in label or "land" in label:
-                                property_data["land_area"] = value
-                
-                # Method 2: Look for data attributes or structured data
-                structured_data = page.evaluate("""() => {
-                    const jsonLd = document.querySelector('script[type="application/ld+json"]');
-                    if (jsonLd) {
-                        try {
-                            return JSON.parse(jsonLd.textContent);
-                        } catch (e) {
-                            return null;
-                        }
-                    }
-                    return null;
-                }""")
-                
-                if structured_data:
-                    property_data["structured_data"] = structured_data
-                
-                # Method 3: Extract all text content from key sections
-                sections = {
-                    "description": ".property-description, .description",
-                    "features": ".property-features, .features",
-                    "location": ".property-location, .location"
-                }
-                
-                for key, selector in sections.items():
-                    section_element = page.query_selector(selector)
-                    if section_element:
-                        property_data[key] = section_element.text_content().strip()
-                
-                # Method 4: Look for image galleries
-                gallery_images = page.query_selector_all(".property-gallery img, .gallery img")
-                if gallery_images:
-                    property_data["images"] = []
-                    for img in gallery_images:
-                        src = img.get_attribute("src")
-                        if src:
-                            property_data["images"].append(src)
-                
-                # Save this property's data
-                all_properties.append(property_data)
-                
-                # Save to individual file
-                output_file = os.path.join(output_dir, f"property_{i+1}_{timestamp}.json")
-                save_to_json(property_data, output_file)
-                
-            except Exception as e:
-                logger.error(f"Error processing URL {url}: {e}")
-        
-        browser.close()
+            # Save to individual file
+            output_file = os.path.join(output_dir, f"property_{i+1}_{timestamp}.json")
+            writer.submit(save_to_json, details[url], output_file)
+    
+    # Wait for the per-property files to be written
+    writer.shutdown(wait=True)
+    await close_client()
+    
+    # Different URLs can point to the same listing
+    seen = {}
+    for property_data in all_properties:
+        seen.setdefault(property_data.get("property_id") or property_data["property_url"], property_data)
+    all_properties = list(seen.values())
     
     # Save all properties together
-    combined_file = os.path.join(output_dir, f"all_properties_{timestamp}.json")
-    save_to_json(all_properties, combined_file)
+    combined_file = os.path.join(output_dir, f"all_properties_{timestamp}.jsonl")
+    save_to_jsonl(all_properties, combined_file)
     
     logger.info(f"Completed testing {len(test_urls)} property pages")
     return all_properties
 
+def test_remax_property_details():
+    """Test extracting details directly from property detail pages"""
+    return asyncio.run(_test_remax_property_details_async())
+
 if __name__ == "__main__":
     test_remax_property_details()
@@ -7,7 +7,8 @@ import sys
 import json
 import logging
 from datetime import datetime
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from remax_test_fixtures import DEBUG, shared_browser
 
 # Configure logging
 logging.basicConfig(
@@ -20,10 +21,39 @@ logger = logging.getLogger("RemaxMainTest")
 TEST_DATA_FOLDER = "test_data/remax_main_test"
 os.makedirs(TEST_DATA_FOLDER, exist_ok=True)
 
-def save_to_json(data, output_file):
-    """Save data to JSON file"""
+# Candidate property element selectors checked on the listing page
+SELECTORS_TO_TRY = [
+    ".gallery-item", 
+    ".propertyListItem", 
+    ".property-item", 
+    ".listingGridBox",
+    ".property-container",
+    ".listing-item",
+    ".search-result-item",
+    ".property-card",
+    "[class*='property']",
+    "[class*='listing']"
+]
+
+# Counts the elements matching each selector in one round-trip
+COUNT_ELEMENTS_SCRIPT = "selectors => Object.fromEntries(selectors.map(s => [s, document.querySelectorAll(s).length]))"
+
+# Requests not needed to inspect the page structure
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+BLOCKED_HOSTS = ("google-analytics.com", "googletagmanager.com", "facebook.net", "doubleclick.net")
+
+def block_unneeded_resources(route):
+    """Route handler aborting images, fonts, styles, media and analytics requests"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOSTS):
+        return route.abort()
+    return route.continue_()
+
+def save_to_jsonl(data, output_file):
+    """Save data to a JSON Lines file, one item per line"""
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        for item in data:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
     logger.info(f"Saved data to {output_file}")
 
 def test_remax_in_main():
@@ -52,50 +82,41 @@ def test_remax_in_main():
     # Initialize empty list for all properties
     all_properties = []
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        
+    with shared_browser() as browser:
         try:
             # Create a page and navigate to Remax to check if we can extract the HTML for analysis
-            context = browser.new_context()
+            context = browser.new_context(viewport={"width": 800, "height": 600})
+            context.route("**/*", block_unneeded_resources)
             page = context.new_page()
             logger.info("Navigating to Remax to check HTML structure")
             page.goto(remax_test_config["base_url"], wait_until="domcontentloaded")
             
-            # Wait for page to load
-            page.wait_for_timeout(5000)
+            # Wait for any property element instead of a fixed delay
+            try:
+                page.wait_for_selector(", ".join(SELECTORS_TO_TRY), state="attached", timeout=7000)
+            except PlaywrightTimeoutError:
+                logger.warning("No property element appeared on the page")
             
             # Save HTML for analysis
             html_folder = os.path.join(TEST_DATA_FOLDER, "html")
             os.makedirs(html_folder, exist_ok=True)
             html_path = os.path.join(html_folder, f"remax_page_{timestamp}.html")
             
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(page.content())
+            # Write the rendered DOM, with the JavaScript-built listings the selectors below look at
+            with open(html_path, "wb") as f:
+                f.write(page.content().encode("utf-8"))
             logger.info(f"Saved HTML to {html_path} for analysis")
             
-            # Take a screenshot
-            screenshot_path = os.path.join(TEST_DATA_FOLDER, f"remax_page_{timestamp}.png")
-            page.screenshot(path=screenshot_path)
-            logger.info(f"Saved screenshot to {screenshot_path}")
+            # Take a screenshot, only with REMAX_DEBUG=1
+            if DEBUG:
+                screenshot_path = os.path.join(TEST_DATA_FOLDER, f"remax_page_{timestamp}.jpg")
+                page.screenshot(path=screenshot_path, type="jpeg", quality=60, full_page=False)
+                logger.info(f"Saved screenshot to {screenshot_path}")
             
             # Check for property elements with different selectors
-            selectors_to_try = [
-                ".gallery-item", 
-                ".propertyListItem", 
-                ".property-item", 
-                ".listingGridBox",
-                ".property-container",
-                ".listing-item",
-                ".search-result-item",
-                ".property-card",
-                "[class*='property']",
-                "[class*='listing']"
-            ]
-            
-            for selector in selectors_to_try:
-                elements = page.query_selector_all(selector)
-                logger.info(f"Selector '{selector}' found {len(elements)} elements")
+            counts = page.evaluate(COUNT_ELEMENTS_SCRIPT, SELECTORS_TO_TRY)
+            for selector, count in counts.items():
+                logger.info("Selector '%s' found %d elements", selector, count)
             
             # Close this context
             context.close()
@@ -107,19 +128,17 @@ def test_remax_in_main():
             logger.info(f"Test completed. Found {len(properties)} properties")
             
             # Save the results
-            output_file = os.path.join(TEST_DATA_FOLDER, f"remax_test_{timestamp}.json")
-            save_to_json(properties, output_file)
+            output_file = os.path.join(TEST_DATA_FOLDER, f"remax_test_{timestamp}.jsonl")
+            save_to_jsonl(properties, output_file)
             
-            if len(properties) > 0:
-                logger.info("Sample property details:")
+            if len(properties) > 0 and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sample property details:")
                 for field, value in list(properties[0].items())[:5]:
-                    logger.info(f"  {field}: {value}")
+                    logger.debug("  %s: %s", field, value)
         except Exception as e:
             logger.error(f"Error running Remax scraper: {e}")
             import traceback
             logger.error(traceback.format_exc())
-        finally:
-            browser.close()
 
 if __name__ == "__main__":
     try:
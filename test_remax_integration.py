@@ -5,9 +5,12 @@ Test script for Remax integration into Tunisian Property Scraper
 import os
 import json
 import time
+import random
 import logging
 from datetime import datetime
-from playwright.sync_api import sync_playwright
+from concurrent.futures import ThreadPoolExecutor
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from remax_test_fixtures import shared_browser
 from urllib.parse import urlparse
 
 # Set up logging
@@ -37,50 +40,89 @@ def wait_with_random_delay(min_seconds=2, max_seconds=5):
     delay = min_seconds + (max_seconds - min_seconds) * random.random()
     time.sleep(delay)
 
-def save_to_json(data, output_file):
-    """Save data to JSON file"""
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    logger.info(f"Saved {len(data)} items to {output_file}")
+# Listing pages loaded at the same time by Method 2, one tab each
+MAX_PARALLEL_PAGES = 3
+
+# Random pause, in seconds, before each listing page request after the first, to stay polite with the site
+REQUEST_DELAY = (1, 2)
+
+# True once the first gallery item differs from the one shown before navigating
+GALLERY_CHANGED_SCRIPT = """previous => {
+    const item = document.querySelector('.gallery-item');
+    return item !== null && item.outerHTML !== previous;
+}"""
 
-def save_to_csv(data, output_file):
-    """Save data to CSV file"""
-    if not data:
-        logger.warning(f"No data to save to {output_file}")
-        return
+def wait_for_gallery(page, url, previous=None):
+    """Wait for the gallery of a page navigated to url to render instead of a fixed delay
     
-    # Get all field names from all properties
-    fieldnames = set()
-    for item in data:
-        for key in item.keys():
-            fieldnames.add(key)
+    Hash changes don't reload the page, so this waits for the first item to differ from previous.
+    """
+    try:
+        page.wait_for_function(GALLERY_CHANGED_SCRIPT, arg=previous, timeout=6000)
+    except PlaywrightTimeoutError:
+        logger.warning(f"Gallery did not change after navigating to {url}")
+
+def scrape_listing_pages(remax_helper, site_config, browser):
+    """Method 2: load the listing pages in tabs of one context and extract their properties
     
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=sorted(list(fieldnames)))
-        writer.writeheader()
-        writer.writerows(data)
+    The sync Playwright API can't be used from other threads, so the pages aren't split across
+    workers: up to MAX_PARALLEL_PAGES tabs are started together, and the browser loads them
+    concurrently while their properties are read one tab after another.
+    Returns a list of (page_number, properties) pairs.
+    """
+    page_numbers = list(range(1, site_config["max_pages"] + 1))
+    pages = []
     
-    logger.info(f"Saved {len(data)} items to {output_file}")
+    context = browser.new_context(viewport={"width": 1280, "height": 800})
+    try:
+        for batch_start in range(0, len(page_numbers), MAX_PARALLEL_PAGES):
+            tabs = []
+            for page_number in page_numbers[batch_start:batch_start + MAX_PARALLEL_PAGES]:
+                if page_number > 1:
+                    wait_with_random_delay(*REQUEST_DELAY)
+                hash_url = remax_helper.handle_remax_hash_pagination(site_config["base_url"], page_number)
+                tab = context.new_page()
+                tab.goto(hash_url, wait_until="commit")
+                tabs.append((page_number, hash_url, tab))
+            
+            for page_number, hash_url, tab in tabs:
+                logger.debug("Processing page %d", page_number)
+                wait_for_gallery(tab, hash_url)
+                
+                # Extract properties
+                property_elements = tab.query_selector_all(site_config["_property_css"])
+                logger.debug("Found %d property elements on page %d", len(property_elements), page_number)
+                
+                pages.append((page_number, [
+                    remax_helper.extract_remax_property_data(element, site_config, site_config["name"], page_number)
+                    for element in property_elements
+                ]))
+                tab.close()
+    finally:
+        context.close()
+    
+    return pages
 
-def test_remax_integration():
-    """Test the Remax integration"""
-    # Define test configuration
-    site_config = {
-        "name": "remax.com.tn",
-        "base_url": "https://www.remax.com.tn/PublicListingList.aspx",
-        "max_pages": 3,  # Limited to 3 pages for testing
-        "property_selectors": [".gallery-item", ".propertyListItem", ".property-item", ".listingGridBox"],
-        "title_selectors": [".gallery-title a", ".property-title", "h3", ".listingTitle", ".property-address"],
-        "price_selectors": [".gallery-price-main .proplist_price", ".gallery-price a", ".price"],
-        "location_selectors": [".gallery-title a", ".location", ".property-location"],
-        "area_selectors": [".gallery-icons img[data-original-title*='Mètres']", ".property-size", ".surface"],
-        "bedrooms_selectors": [".gallery-icons img[data-original-title*='chambres']", ".bedrooms", ".beds"],
-        "bathrooms_selectors": [".gallery-icons img[data-original-title*='salles de bain']", ".bathrooms", ".baths"],
-        "features_selectors": [".features", ".amenities", ".propertyFeatures"],
-        "hash_url_pagination": True
-    }
+def dedupe_properties(properties):
+    """Drop repeated listings, which overlapping pagination pages can show twice
     
-    # First method - import directly from the remax_playwright_integration module
+    Listings are identified by their URL or property ID; the ones without either are all kept.
+    """
+    seen = {}
+    for prop in properties:
+        key = prop.get("listing_url") or prop.get("property_url") or prop.get("property_id") or id(prop)
+        seen.setdefault(key, prop)
+    return list(seen.values())
+
+def save_to_jsonl(data, output_file):
+    """Save data to a JSON Lines file, one item per line"""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for item in data:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+    logger.info(f"Saved {len(data)} items to {output_file}")
+
+def run_method1(site_config):
+    """Method 1: scrape with the remax_playwright_integration module"""
     try:
         from remax_playwright_integration import scrape_remax_with_playwright
         logger.info("Method 1: Testing remax_playwright_integration.py")
@@ -88,84 +130,70 @@ def test_remax_integration():
             site_config["base_url"], 
             max_pages=site_config["max_pages"]
         )
-        output_file = os.path.join(TEST_DATA_FOLDER, f"remax_method1_{TIMESTAMP}.json")
-        save_to_json(properties, output_file)
+        properties = dedupe_properties(properties)
+        output_file = os.path.join(TEST_DATA_FOLDER, f"remax_method1_{TIMESTAMP}.jsonl")
+        save_to_jsonl(properties, output_file)
         logger.info(f"Method 1 found {len(properties)} properties")
     except ImportError:
         logger.error("remax_playwright_integration.py not found")
-    
-    # Second method - import from remax_helper 
+
+def run_method2(site_config):
+    """Method 2: scrape with remax_helper, loading the listing pages in tabs of the shared test browser"""
     try:
         import remax_helper
         logger.info("Method 2: Testing remax_helper.py")
         
         properties = []
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(viewport={"width": 1280, "height": 800})
-            page = context.new_page()
-            
+        with shared_browser() as browser:
             try:
-                # Navigate to base URL
-                page.goto(site_config["base_url"], wait_until="domcontentloaded")
-                
-                # Add hash parameters if needed
-                current_url = page.url
-                if "#" not in current_url:
-                    hash_url = remax_helper.handle_remax_hash_pagination(current_url, 1)
-                    page.goto(hash_url, wait_until="domcontentloaded")
-                    time.sleep(3)
-                
-                # Process pages
-                page_count = 1
-                site_properties = []
-                
-                while page_count <= site_config["max_pages"]:
-                    logger.info(f"Processing page {page_count}")
-                    
-                    # Extract properties
-                    property_elements = page.query_selector_all(", ".join(site_config["property_selectors"]))
-                    logger.info(f"Found {len(property_elements)} property elements")
-                    
-                    # Process properties
-                    for element in property_elements:
-                        prop_data = remax_helper.extract_remax_property_data(
-                            element, site_config, site_config["name"], page_count
-                        )
-                        site_properties.append(prop_data)
-                    
-                    # Go to next page if not at max
-                    if page_count >= site_config["max_pages"]:
-                        break
-                    
-                    # Navigate to next page
-                    next_page = page_count + 1
-                    next_url = remax_helper.handle_remax_hash_pagination(page.url, next_page)
-                    page.goto(next_url, wait_until="domcontentloaded")
-                    page_count += 1
-                    time.sleep(3)
-                
-                properties = site_properties
-                
+                pages = scrape_listing_pages(remax_helper, site_config, browser)
             except Exception as e:
                 logger.error(f"Error in Method 2: {e}")
-            
-            finally:
-                browser.close()
+                pages = []
+        
+        for _, page_properties in pages:
+            properties.extend(page_properties)
+        properties = dedupe_properties(properties)
         
-        output_file = os.path.join(TEST_DATA_FOLDER, f"remax_method2_{TIMESTAMP}.json")
-        save_to_json(properties, output_file)
+        output_file = os.path.join(TEST_DATA_FOLDER, f"remax_method2_{TIMESTAMP}.jsonl")
+        save_to_jsonl(properties, output_file)
         logger.info(f"Method 2 found {len(properties)} properties")
         
     except ImportError:
         logger.error("remax_helper.py not found")
+
+def test_remax_integration():
+    """Test the Remax integration"""
+    # Define test configuration
+    site_config = {
+        "name": "remax.com.tn",
+        "base_url": "https://www.remax.com.tn/PublicListingList.aspx",
+        "max_pages": 3,  # Limited to 3 pages for testing
+        "property_selectors": [".gallery-item", ".propertyListItem", ".property-item", ".listingGridBox"],
+        "title_selectors": [".gallery-title a", ".property-title", "h3", ".listingTitle", ".property-address"],
+        "price_selectors": [".gallery-price-main .proplist_price", ".gallery-price a", ".price"],
+        "location_selectors": [".gallery-title a", ".location", ".property-location"],
+        "area_selectors": [".gallery-icons img[data-original-title*='Mètres']", ".property-size", ".surface"],
+        "bedrooms_selectors": [".gallery-icons img[data-original-title*='chambres']", ".bedrooms", ".beds"],
+        "bathrooms_selectors": [".gallery-icons img[data-original-title*='salles de bain']", ".bathrooms", ".baths"],
+        "features_selectors": [".features", ".amenities", ".propertyFeatures"],
+        "hash_url_pagination": True
+    }
+    # Joined once here rather than on every listing page
+    site_config["_property_css"] = ", ".join(site_config["property_selectors"])
+    
+    # The two methods are independent, so run them side by side. Method 1 starts its own
+    # Playwright in a worker thread; Method 2 stays on this thread, which the shared
+    # test browser belongs to
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        method1 = executor.submit(run_method1, site_config)
+        run_method2(site_config)
+        method1.result()
     
     logger.info("Integration test completed")
 
 if __name__ == "__main__":
     try:
-        import csv
-        import random
         test_remax_integration()
     except Exception as e:
         logger.error(f"Error during test: {e}")
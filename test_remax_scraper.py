@@ -6,7 +6,7 @@ import time
 import os
 import logging
 from datetime import datetime
-from playwright.sync_api import sync_playwright
+from remax_test_fixtures import shared_browser
 from tunisian_property_scraper import (
     SITE_CONFIGS, 
     scrape_properties, 
@@ -60,20 +60,7 @@ def test_remax_scraping():
     # Initialize storage for properties
     all_properties = []
     
-    with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(
-            headless=False,  # Show the browser for debugging
-            args=[
-                '--disable-dev-shm-usage',
-                '--disable-features=site-per-process',
-                '--disable-web-security',
-                '--no-sandbox',
-                '--window-size=1920,1080'
-            ],
-            slow_mo=100,  # Slow down operations for better visibility
-            timeout=180000  # 3 minutes timeout
-        )
-        
+    with shared_browser() as browser:
         try:
             # Run the scraper on Remax only
             remax_properties = scrape_properties(test_config, browser, all_properties)
@@ -93,15 +80,12 @@ def test_remax_scraping():
                 with open(test_csv, 'w', newline='', encoding='utf-8') as csvfile:
                     writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
                     writer.writeheader()
-                    for item in remax_properties:
-                        writer.writerow({k: item.get(k, '') for k in fieldnames})
+                    writer.writerows({k: item.get(k, '') for k in fieldnames} for item in remax_properties)
                 
                 logger.info(f"Saved test results to {test_csv}")
             
         except Exception as e:
             logger.error(f"Error during test: {str(e)}")
-        finally:
-            browser.close()
     
     return all_properties
 
@@ -1,14 +1,48 @@
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+import asyncio
+import atexit
 import csv
 import json
+import logging
 import os
+import re
 import time
+from contextlib import contextmanager
 from datetime import datetime
 
+# orjson is optional, the standard json module is used without it
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# httpx is optional: without it the search pages are always loaded in the browser
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# selectolax is optional: without it the served HTML can't be parsed and the browser is used
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
+# Configure logging: page progress is reported at INFO level, per-property messages at DEBUG;
+# LOG_LEVEL=WARNING quiets the progress messages
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("TestScraper")
+
 # Create output folder
 OUTPUT_FOLDER = "real_estate_data"
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
@@ -16,6 +50,57 @@ os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 # Generate timestamp for this session
 TIMESTAMP = datetime.now().strftime('%Y%m%d_%H%M%S')
 
+# Debug screenshots are only taken with SCRAPER_DEBUG=1
+DEBUG = os.getenv("SCRAPER_DEBUG") == "1"
+
+# Fi-dari.tn search results, one URL per page
+SEARCH_URL = "https://fi-dari.tn/search?objectif=vendre&usage=Tout+usage&bounds=[[37.649,7.778],[30.107,11.953]]&page={page}"
+
+# Time allowed for the property links to appear, kept short so failures surface fast (ms)
+LISTINGS_TIMEOUT = 15000
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
+
+# Number of cards read per page, enough for quick testing
+CARDS_PER_PAGE = 3
+
+# Maximum number of pages loaded at the same time
+MAX_PARALLEL_PAGES = 4
+
+# Browser profile kept between runs, so the HTTP cache and cookies of the site stay warm
+PROFILE_DIR = os.path.join(OUTPUT_FOLDER, ".pw-profile")
+
+# Resource types not downloaded, only DOM text and img src attributes are read
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+
+# Selectors of the property cards, defined once and handed to the extraction script
+LINK_SEL = 'a[href^="/bien/"]'
+CARD_BODY_SEL = ".b-annonce-card-body"
+TITLE_SEL = ".card-title"
+PRICE_SEL = ".text-primary"
+LOCATION_ICON_SEL = ".fa-map-marker"
+IMAGE_SEL = "img"
+CARD_SELECTORS = {
+    "link": LINK_SEL,
+    "body": CARD_BODY_SEL,
+    "title": TITLE_SEL,
+    "price": PRICE_SEL,
+    "locationIcon": LOCATION_ICON_SEL,
+    "image": IMAGE_SEL
+}
+
+# Property type keywords looked up in the listing title, mapped to their label
+PTYPE_MAP = {
+    "appartement": "Appartement",
+    "villa": "Villa",
+    "maison": "Maison",
+    "duplex": "Duplex"
+}
+PTYPE_RE = re.compile("(" + "|".join(map(re.escape, PTYPE_MAP)) + ")", re.IGNORECASE)
+
+# Runs of whitespace collapsed by clean_text
+_WS_RE = re.compile(r"\s+")
+
 # Common field names for CSV
 FIELDNAMES = [
     "title", "price", "location", "bedrooms", "bathrooms", 
@@ -23,201 +108,356 @@ FIELDNAMES = [
     "image_url", "listing_url", "source_site", "page_number"
 ]
 
+# Runs in the browser and reads the first property cards in one round-trip.
+# Returns the number of property links and, for the first `limit` of them, the raw card fields
+# with the property type already looked up from the title with the PTYPE_MAP keywords.
+EXTRACT_CARDS_SCRIPT = """
+([limit, sel, ptypes]) => {
+    const ptypeRe = new RegExp(Object.keys(ptypes).join("|"), "i");
+    const links = Array.from(document.querySelectorAll(sel.link));
+    const cards = links.slice(0, limit).map(link => {
+        const card = link.querySelector(sel.body);
+        const text = selector => {
+            const element = card ? card.querySelector(selector) : null;
+            return element ? element.innerText.trim() : "";
+        };
+        
+        // The location is the last line of the block holding the map marker icon,
+        // reached with a plain DOM walk instead of an XPath lookup
+        const marker = card?.querySelector(sel.locationIcon);
+        const location = (marker?.parentElement?.parentElement?.innerText || "").split("\\n").pop().trim();
+        
+        const title = text(sel.title);
+        const ptype = title.match(ptypeRe);
+        
+        const img = card ? card.querySelector(sel.image) : null;
+        return {
+            href: link.getAttribute("href") || "",
+            title: title,
+            price: text(sel.price),
+            location: location,
+            property_type: ptype ? ptypes[ptype[0].toLowerCase()] : "",
+            image_url: img ? (img.getAttribute("src") || "") : ""
+        };
+    });
+    return [links.length, cards];
+}
+"""
+
 def clean_text(text):
     """Clean the text by removing extra spaces and unwanted characters"""
-    if not text:
-        return ""
-    return " ".join(text.strip().split())
+    return _WS_RE.sub(" ", text).strip() if text else ""
 
-def extract_text(element, selector):
-    """Extract text from an element using selector, with error handling"""
-    try:
-        if element.locator(selector).count() > 0:
-            return element.locator(selector).first.inner_text().strip()
-    except Exception as e:
-        pass
-    return ""
+async def block_heavy_resources(route):
+    """Route handler aborting the resources the extraction doesn't need"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
 
-def extract_attribute(element, selector, attribute):
-    """Extract attribute from an element using selector, with error handling"""
-    try:
-        if element.locator(selector).count() > 0:
-            return element.locator(selector).first.get_attribute(attribute)
-    except Exception as e:
-        pass
-    return ""
+def handle_cards(cards, page_number, domain, on_property):
+    """Build the property rows from the raw card fields and hand them to on_property
+    
+    Returns the number of properties handed over.
+    """
+    properties_count = 0
+    
+    for i, card in enumerate(cards):
+        try:
+            href = card["href"]
+            
+            if not href:
+                logger.debug("Skipping link %d - no href found", i + 1)
+                continue
+            
+            # Create the listing URL
+            listing_url = f"https://{domain}{href}"
+            
+            title = card["title"]
+            image_url = card["image_url"]
+            location = clean_text(card["location"])
+            
+            # Price is the amount before the currency
+            price = ""
+            price_text = clean_text(card["price"])
+            if "DT" in price_text:
+                price = price_text.split("DT")[0].strip()
+            
+            # Create property data
+            property_data = {
+                "title": title,
+                "price": price,
+                "location": location,
+                "bedrooms": "",
+                "bathrooms": "",
+                "area": "",
+                "property_type": card["property_type"],
+                "description": "",
+                "features": "",
+                "image_url": image_url,
+                "listing_url": listing_url,
+                "source_site": domain,
+                "page_number": page_number
+            }
+            
+            # Save the property right away
+            on_property(property_data)
+            properties_count += 1
+            logger.debug("Added test property %d of page %d: %s... | %s | %s", i + 1, page_number, title[:30], price, location)
+            
+        except Exception as e:
+            logger.error("Error processing property link %d of page %d: %s", i + 1, page_number, e)
+    
+    return properties_count
 
-def scrape_single_site():
-    """Test scraper that focuses on Fi-dari.tn with link-based extraction"""
-    url = "https://fi-dari.tn/search?objectif=vendre&usage=Tout+usage&bounds=[[37.649,7.778],[30.107,11.953]]&page=1"
-    domain = "fi-dari.tn"
+def parse_cards_html(html, limit):
+    """Read the property cards from a search page's HTML with selectolax
     
-    print(f"\nStarting test scraping of: {url}")
-    all_properties = []
+    Same fields as EXTRACT_CARDS_SCRIPT: returns the number of property links and the raw
+    fields of the first `limit` cards.
+    """
+    tree = LexborHTMLParser(html)
+    links = tree.css(LINK_SEL)
     
-    with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(headless=False)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
-        )
-        page = context.new_page()
+    cards = []
+    for link in links[:limit]:
+        card = link.css_first(CARD_BODY_SEL)
+        
+        def text(selector):
+            element = card.css_first(selector) if card is not None else None
+            return element.text(strip=True) if element is not None else ""
+        
+        # Without a layout there is no innerText, the last text node of the block stands for its last line
+        marker = card.css_first(LOCATION_ICON_SEL) if card is not None else None
+        location_block = marker.parent.parent if marker is not None and marker.parent is not None else None
+        location_lines = location_block.text(separator="\n").split("\n") if location_block is not None else []
+        location = next((line.strip() for line in reversed(location_lines) if line.strip()), "")
+        
+        title = text(TITLE_SEL)
+        ptype = PTYPE_RE.search(title)
+        
+        img = card.css_first(IMAGE_SEL) if card is not None else None
+        cards.append({
+            "href": link.attributes.get("href") or "",
+            "title": title,
+            "price": text(PRICE_SEL),
+            "location": location,
+            "property_type": PTYPE_MAP[ptype.group(1).lower()] if ptype else "",
+            "image_url": (img.attributes.get("src") or "") if img is not None else ""
+        })
+    
+    return len(links), cards
+
+async def fetch_page_cards(client, page_number):
+    """Fetch one search page over plain HTTP and read its cards"""
+    logger.info("Fetching page %d...", page_number)
+    response = await client.get(SEARCH_URL.format(page=page_number))
+    response.raise_for_status()
+    return parse_cards_html(response.text, CARDS_PER_PAGE)
+
+async def scrape_pages_http(max_pages, domain, on_property):
+    """Scrape the search pages with plain HTTP requests, without a browser
+    
+    Returns the number of properties, or None when the first page can't be fetched or
+    its served HTML has no property links, so the caller can fall back to the browser.
+    """
+    async with httpx.AsyncClient(headers={"User-Agent": USER_AGENT}, timeout=20, follow_redirects=True) as client:
+        try:
+            links_count, cards = await fetch_page_cards(client, 1)
+        except httpx.HTTPError as e:
+            logger.warning("Error fetching page 1: %s", e)
+            return None
+        
+        if not links_count:
+            logger.info("No property links in the served HTML, falling back to the browser")
+            return None
+        logger.info("Found %d property links on page 1", links_count)
+        properties_count = handle_cards(cards, 1, domain, on_property)
         
+        # The other pages are fetched all at once on the pooled connections
+        page_numbers = range(2, max_pages + 1)
+        results = await asyncio.gather(*[
+            fetch_page_cards(client, page_number) for page_number in page_numbers
+        ], return_exceptions=True)
+        
+        for page_number, result in zip(page_numbers, results):
+            if isinstance(result, Exception):
+                logger.error("Error fetching page %d: %s", page_number, result)
+                continue
+            links_count, cards = result
+            logger.info("Found %d property links on page %d", links_count, page_number)
+            properties_count += handle_cards(cards, page_number, domain, on_property)
+    
+    return properties_count
+
+async def scrape_page(context, semaphore, url, page_number, domain, on_property):
+    """Load one search results page and hand its first property cards to on_property
+    
+    Returns the number of properties found on the page.
+    """
+    properties_count = 0
+    async with semaphore:
+        page = await context.new_page()
         try:
             # Navigate to the URL
-            print(f"Loading page...")
-            page.goto(url, timeout=60000)
+            logger.info("Loading page %d...", page_number)
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
             
-            # Wait for content to load
-            page.wait_for_selector("a[href^='/bien/']", timeout=60000)
+            # Wait for the first property link to be in the DOM, the hrefs don't need it to be visible
+            await page.wait_for_selector(LINK_SEL, state="attached", timeout=LISTINGS_TIMEOUT)
             
             # Take a screenshot for debugging
-            screenshot_file = f"{domain}_test_homepage.png"
-            page.screenshot(path=os.path.join(OUTPUT_FOLDER, screenshot_file))
-            print(f"Saved screenshot to {screenshot_file}")
-            
-            # Let's process just one page for testing
-            print(f"Processing test page...")
+            if DEBUG and page_number == 1:
+                screenshot_file = f"{domain}_test_homepage.jpg"
+                await page.screenshot(path=os.path.join(OUTPUT_FOLDER, screenshot_file), type="jpeg", quality=60)
+                logger.debug("Saved screenshot to %s", screenshot_file)
             
-            # Get property links directly
-            property_links = page.locator('a[href^="/bien/"]').all()
-            print(f"Found {len(property_links)} property links")
-            
-            # Process just 3 property links for quick testing
-            for i, link in enumerate(property_links[:3]):
-                try:
-                    # Get the href
-                    href = link.get_attribute("href") or ""
-                    
-                    if not href:
-                        print(f"Skipping link {i+1} - no href found")
-                        continue
-                    
-                    # Create the listing URL
-                    listing_url = f"https://{domain}{href}"
-                    
-                    # Get the card element for this link
-                    card = link.locator(".b-annonce-card-body").first
-                    
-                    # Extract data directly from the card
-                    title = ""
-                    price = ""
-                    location = ""
-                    image_url = ""
-                    
-                    # Get title
-                    title_el = card.locator(".card-title")
-                    if title_el.count() > 0:
-                        title = title_el.first.inner_text().strip()
-                    
-                    # Get price
-                    price_el = card.locator(".text-primary")
-                    if price_el.count() > 0:
-                        price_text = clean_text(price_el.first.inner_text())
-                        if "DT" in price_text:
-                            price = price_text.split("DT")[0].strip()
-                    
-                    # Get location
-                    location_el = card.locator(".fa-map-marker").locator("xpath=../..")
-                    if location_el.count() > 0:
-                        location_text = clean_text(location_el.first.inner_text())
-                        location = location_text.split("\n")[-1].strip() if "\n" in location_text else location_text
-                    
-                    # Get image URL
-                    img_el = card.locator("img")
-                    if img_el.count() > 0:
-                        image_url = img_el.first.get_attribute("src") or ""
-                    
-                    # Extract property type from title
-                    property_type = ""
-                    if title:
-                        if "appartement" in title.lower():
-                            property_type = "Appartement"
-                        elif "villa" in title.lower():
-                            property_type = "Villa"
-                        elif "maison" in title.lower():
-                            property_type = "Maison"
-                        elif "duplex" in title.lower():
-                            property_type = "Duplex"
-                    
-                    # Create property data
-                    property_data = {
-                        "title": title,
-                        "price": price,
-                        "location": location,
-                        "bedrooms": "",
-                        "bathrooms": "",
-                        "area": "",
-                        "property_type": property_type,
-                        "description": "",
-                        "features": "",
-                        "image_url": image_url,
-                        "listing_url": listing_url,
-                        "source_site": domain,
-                        "page_number": 1
-                    }
-                    
-                    # Add property to our list
-                    all_properties.append(property_data)
-                    print(f"  Added test property {i+1}: {title[:30]}... | {price} | {location}")
-                    
-                except Exception as e:
-                    print(f"Error processing property link {i+1}: {str(e)}")
-            
-            print(f"Completed test scraping. Found {len(all_properties)} properties.")
+            # Read just the first cards in a single round-trip
+            links_count, cards = await page.evaluate(EXTRACT_CARDS_SCRIPT, [CARDS_PER_PAGE, CARD_SELECTORS, PTYPE_MAP])
+            logger.info("Found %d property links on page %d", links_count, page_number)
             
+            properties_count = handle_cards(cards, page_number, domain, on_property)
+        
         except Exception as e:
-            print(f"Error in test scraping: {str(e)}")
+            logger.error("Error scraping page %d: %s", page_number, e)
         finally:
-            browser.close()
+            await page.close()
     
-    return all_properties
+    return properties_count
 
-def save_to_csv(data, filename):
-    """Save the scraped data to a CSV file"""
-    with open(filename, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=FIELDNAMES)
-        writer.writeheader()
+# Playwright, its persistent browser context and the event loop driving them,
+# started on the first scrape and shared by the following ones
+_LOOP = None
+_PW = None
+_CONTEXT = None
+
+def _run(coro):
+    """Run a coroutine on the module event loop, which outlives a single scrape call"""
+    global _LOOP
+    if _LOOP is None:
+        _LOOP = asyncio.new_event_loop()
+    return _LOOP.run_until_complete(coro)
+
+async def _get_context():
+    """Return the shared browser context, launching Playwright on first use"""
+    global _PW, _CONTEXT
+    if _CONTEXT is None:
+        if _PW is None:
+            _PW = await async_playwright().start()
+            atexit.register(_close_context)
+        _CONTEXT = await _PW.chromium.launch_persistent_context(
+            user_data_dir=PROFILE_DIR,
+            headless=True,
+            user_agent=USER_AGENT
+        )
+        await _CONTEXT.route("**/*", block_heavy_resources)
+    return _CONTEXT
+
+def _close_context():
+    """Close the shared browser context and stop Playwright"""
+    global _PW, _CONTEXT
+    if _CONTEXT is not None:
+        _run(_CONTEXT.close())
+        _CONTEXT = None
+    if _PW is not None:
+        _run(_PW.stop())
+        _PW = None
+    _LOOP.close()
+
+async def _scrape_single_site_async(max_pages, on_property):
+    """Scrape the search results pages concurrently, over plain HTTP when possible
+    
+    The shared browser context is only used when the served HTML has no property cards.
+    """
+    domain = "fi-dari.tn"
+    
+    logger.info("Starting test scraping of: %s", SEARCH_URL.format(page=1))
+    properties_count = 0
+    
+    # Plain HTTP needs selectolax to parse the pages; the browser stays the fallback
+    if HTTPX_AVAILABLE and SELECTOLAX_AVAILABLE:
+        http_count = await scrape_pages_http(max_pages, domain, on_property)
+        if http_count is not None:
+            logger.info("Completed test scraping. Found %d properties.", http_count)
+            return http_count
+    
+    try:
+        context = await _get_context()
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_PAGES)
         
-        for prop in data:
-            # Create a row with all possible fields
-            row = {field: "" for field in FIELDNAMES}
-            
-            # Update with available data
-            for key, value in prop.items():
-                if key in FIELDNAMES:
-                    row[key] = value
-                    
-            writer.writerow(row)
+        results = await asyncio.gather(*(
+            scrape_page(context, semaphore, SEARCH_URL.format(page=i + 1), i + 1, domain, on_property)
+            for i in range(max_pages)
+        ))
+        
+        properties_count = sum(results)
+        logger.info("Completed test scraping. Found %d properties.", properties_count)
+        
+    except Exception as e:
+        logger.error("Error in test scraping: %s", e)
     
-    print(f"Data saved to: {filename}")
+    return properties_count
 
-def save_to_json(data, filename):
-    """Save the scraped data to a JSON file"""
-    with open(filename, "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=4, ensure_ascii=False)
+def scrape_single_site(on_property, max_pages=1):
+    """Test scraper that focuses on Fi-dari.tn with link-based extraction
     
-    print(f"Data saved to: {filename}")
+    Every property is passed to on_property as soon as it's scraped, the number of properties is returned.
+    Only the first page is scraped by default, for quick testing.
+    The browser is kept open for the next calls and closed when the interpreter exits.
+    """
+    return _run(_scrape_single_site_async(max_pages, on_property))
+
+def dump_json(data):
+    """Serialize data as compact UTF-8 encoded JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+@contextmanager
+def property_writers(csv_filename, json_filename):
+    """Open the CSV and JSON outputs and yield a function writing one property to both
+    
+    Each property is written as soon as it's scraped, the JSON file is an array with one property per line.
+    """
+    with open(csv_filename, "w", newline="", encoding="utf-8") as csv_file, \
+            open(json_filename, "wb") as json_file:
+        writer = csv.DictWriter(csv_file, fieldnames=FIELDNAMES, extrasaction="ignore", restval="")
+        writer.writeheader()
+        json_file.write(b"[")
+        separator = b"\n"
+        
+        def write_property(prop):
+            nonlocal separator
+            writer.writerow(prop)
+            json_file.write(separator + dump_json(prop))
+            separator = b",\n"
+        
+        try:
+            yield write_property
+        finally:
+            json_file.write(b"\n]\n")
+    
+    logger.info("Data saved to: %s", csv_filename)
+    logger.info("Data saved to: %s", json_filename)
 
 def main():
     """Main function to run test scraper"""
-    print(f"Starting test scraper at {TIMESTAMP}")
+    logger.info("Starting test scraper at %s", TIMESTAMP)
     
-    # Scrape the site
-    properties = scrape_single_site()
+    csv_filename = os.path.join(OUTPUT_FOLDER, f"test_scraper_{TIMESTAMP}.csv")
+    json_filename = os.path.join(OUTPUT_FOLDER, f"test_scraper_{TIMESTAMP}.json")
     
-    # Save results
-    if properties:
-        csv_filename = os.path.join(OUTPUT_FOLDER, f"test_scraper_{TIMESTAMP}.csv")
-        json_filename = os.path.join(OUTPUT_FOLDER, f"test_scraper_{TIMESTAMP}.json")
-        
-        save_to_csv(properties, csv_filename)
-        save_to_json(properties, json_filename)
-        
-        print(f"\nTest scraping completed. Properties collected: {len(properties)}")
+    # Scrape the site, saving the properties as they come
+    with property_writers(csv_filename, json_filename) as write_property:
+        properties_count = scrape_single_site(on_property=write_property)
+    
+    # The run summary is the script's output, it is printed whatever the log level
+    if properties_count:
+        print(f"\nTest scraping completed. Properties collected: {properties_count}")
         print(f"- CSV file: {csv_filename}")
         print(f"- JSON file: {json_filename}")
     else:
-        print("\nNo properties were collected during test.")
+        logger.warning("No properties were collected during test.")
 
 if __name__ == "__main__":
     main()
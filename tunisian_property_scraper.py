@@ -9,8 +9,39 @@ import pandas as pd
 import numpy as np
 from dotenv import load_dotenv
 from datetime import datetime
-from urllib.parse import urlparse
-from playwright.sync_api import sync_playwright
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse, urljoin
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+
+# orjson is optional, the standard json module is used without it
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# httpx and selectolax are optional: without them the sites with static listing pages
+# are loaded in the browser like the others
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# pyarrow (pandas' Parquet engine) is optional, the raw data is only handed to the
+# cleaning step as CSV without it
+try:
+    import pyarrow
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 # Set up logging
 logging.basicConfig(
@@ -35,9 +66,20 @@ HTML_DUMPS_FOLDER = "real_estate_data/html_dumps"
 for folder in [RAW_DATA_FOLDER, CLEAN_DATA_FOLDER, SCREENSHOTS_FOLDER, HTML_DUMPS_FOLDER]:
     os.makedirs(folder, exist_ok=True)
 
+# Screenshots (JPEG, viewport only) and HTML dumps of the pages are only saved with SCRAPER_DEBUG=1
+DEBUG = os.getenv("SCRAPER_DEBUG") == "1"
+
+# Polite pause after each page loads, in seconds (SCRAPER_MIN_DELAY/SCRAPER_MAX_DELAY
+# trade politeness for throughput)
+_MIN_DELAY = float(os.getenv("SCRAPER_MIN_DELAY", "0.3"))
+_MAX_DELAY = float(os.getenv("SCRAPER_MAX_DELAY", "0.9"))
+
 # Generate timestamp for this session
 TIMESTAMP = datetime.now().strftime('%Y%m%d_%H%M%S')
 
+# User agent of the browser contexts and HTTP requests
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
+
 # Common field names for CSV
 FIELDNAMES = [
     "title", "price", "location", "bedrooms", "bathrooms", 
@@ -92,7 +134,8 @@ SITE_CONFIGS = [    {
         "area_selectors": [".surface", "span:has-text('m²')"],
         "bedrooms_selectors": ["span:has-text('chambres')", "span:has-text('pièces')"],
         "bathrooms_selectors": ["span:has-text('sdb')", "span:has-text('salles de bain')"],
-        "features_selectors": [".caractere", ".features"]
+        "features_selectors": [".caractere", ".features"],
+        "static_html": True  # Listings are in the served HTML, no browser needed
     },
     {        "name": "menzili.tn",
         "base_url": "https://www.menzili.tn/immo/vente-immobilier-tunisie",
@@ -106,7 +149,8 @@ SITE_CONFIGS = [    {
         "bedrooms_selectors": [".rooms", "span:has-text('chambres')", "span:has-text('pièces')"],
         "bathrooms_selectors": [".baths", "span:has-text('sdb')", "span:has-text('salles de bain')"],
         "features_selectors": [".features", ".amenities"],
-        "land_area_selectors": [".block-opt-1:has-text('Surf terrain')"]
+        "land_area_selectors": [".block-opt-1:has-text('Surf terrain')"],
+        "static_html": True  # Listings are in the served HTML, no browser needed
     },
     {
         "name": "fi-dari.tn",
@@ -136,6 +180,27 @@ SITE_CONFIGS = [    {
     }
 ]
 
+# Time allowed for the first listing of a page to appear (ms)
+LISTINGS_TIMEOUT = 15000
+
+# Number of websites scraped at the same time, each in its own thread and browser
+MAX_PARALLEL_SITES = 3
+
+# Rows written to a site's CSV between flushes to disk
+CSV_FLUSH_ROWS = 500
+
+# Resource types not downloaded by the browser
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Property elements of a Remax listing page
+REMAX_PROPERTY_SELECTOR = ".gallery-item, .propertyListItem, .property-item, .listingGridBox, .property-container, .listing-item"
+
+# Hash of a Remax listing URL when the site doesn't set one
+REMAX_DEFAULT_HASH = "mode=gallery&tt=261&cur=TND&sb=MostRecent&page={page}&sc=1048"
+
+# The page parameter of a Remax hash, used when no pagination module is available
+_PAGE_PARAM_RE = re.compile(r"(?<=[#&])page=[^&#]*")
+
 # Additional regional Tecnocasa URLs to scrape
 TECNOCASA_REGIONS = [
     # Traditional URL format
@@ -160,23 +225,147 @@ TECNOCASA_REGIONS = [
     "https://www.tecnocasa.tn/vendre/immeubles/sud-est-se/medenine.html"
 ]
 
+# Fields read by extract_property, each from the "<field>_selectors" list of the site config
+EXTRACT_FIELDS = ["title", "price", "location", "area", "bedrooms", "bathrooms", "features"]
+
+# Playwright's :has-text() pseudo-class, which the browser's querySelector doesn't know
+_HAS_TEXT_RE = re.compile(r"""^(.*):has-text\((['"])(.*)\2\)$""")
+
+# Browser function returning the first node under root matched by a list of selectors,
+# trying them in order as a query_selector loop would; [css, text] pairs stand for
+# css:has-text(text)
+FIRST_MATCH_JS = """
+(root, selectors) => {
+    for (const [css, text] of selectors) {
+        let node = null;
+        try {
+            node = text === null
+                ? root.querySelector(css)
+                : Array.from(root.querySelectorAll(css)).find(n => n.textContent.toLowerCase().includes(text));
+        } catch (e) {
+            continue;  // Selector the browser can't parse
+        }
+        if (node) return node;
+    }
+    return null;
+}
+"""
+
+# Runs in the browser on a property element and reads every field in one round-trip.
+# For each field the first selector matching inside the element wins.
+EXTRACT_PROPERTY_SCRIPT = """
+(element, fields) => {
+    const firstMatch = selectors => (""" + FIRST_MATCH_JS + """)(element, selectors);
+    
+    const data = {};
+    for (const [field, selectors] of Object.entries(fields)) {
+        const node = firstMatch(selectors);
+        if (node) data[field] = (node.textContent || "").trim();
+    }
+    
+    const img = element.querySelector("img");
+    if (img) data.image_url = img.getAttribute("src");
+    
+    const link = element.querySelector("a");
+    if (link) data.listing_url = link.getAttribute("href");
+    
+    return data;
+}
+"""
+
+# Reads every property of a listing page in one round-trip
+EXTRACT_PAGE_SCRIPT = """
+([propertyCss, fields]) => Array.from(
+    document.querySelectorAll(propertyCss),
+    element => (""" + EXTRACT_PROPERTY_SCRIPT + """)(element, fields)
+)
+"""
+
+# Finds the next page link candidates of a listing page in one round-trip: the first
+# node of each pagination selector, in the configured order and without repeats, so a
+# failed click can fall through to the next candidate
+FIND_NEXT_PAGE_SCRIPT = """
+selectors => {
+    const firstMatch = (""" + FIRST_MATCH_JS + """);
+    const candidates = [];
+    for (const selector of selectors) {
+        const node = firstMatch(document, [selector]);
+        if (node && !candidates.includes(node)) candidates.push(node);
+    }
+    return candidates;
+}
+"""
+
+# Map of common location spelling variants to standardized names
+LOCATION_MAP = {
+    # Tunis region
+    "tunis": "Tunis", 
+    "grand tunis": "Tunis",
+    "le grand tunis": "Tunis",
+    # Major cities
+    "ariana": "Ariana",
+    "l'ariana": "Ariana",
+    "ben arous": "Ben Arous",
+    "manouba": "Manouba",
+    "la manouba": "Manouba",
+    "sousse": "Sousse",
+    "nabeul": "Nabeul",
+    "monastir": "Monastir",
+    "sfax": "Sfax",
+    "hammamet": "Hammamet",
+    # Add more mappings as needed
+}
+
+# All the location variants in one alternation, longest first so the most specific variant wins
+_LOC_RE = re.compile("(" + "|".join(sorted(map(re.escape, LOCATION_MAP), key=len, reverse=True)) + ")")
+
+# Property type keywords and the type they stand for
+_PT_MAP = {
+    "appartement": "Appartement",
+    "villa": "Villa",
+    "maison": "Maison",
+    "studio": "Studio",
+    "duplex": "Duplex",
+    "bureau": "Bureau",
+    "local": "Local Commercial",
+    "terrain": "Terrain",
+    "ferme": "Ferme"
+}
+_PT_RE = re.compile("(" + "|".join(_PT_MAP) + ")", re.IGNORECASE)
+
+# Patterns used by the helpers, compiled once
+_WS_RE = re.compile(r'\s+')
+# Numbers, prices and areas: bounded, starting and ending next to a non-digit, so a
+# malformed value with a long run of digits fails instead of matching part of it; the
+# optional unit suffixes never changed the captured number and are left out
+_NUM_RE = re.compile(r"(?<!\d)(\d[\d\s,.']{0,20})(?=\D|$)")
+_BEDS_RE = re.compile(r"(?<!\d)(\d{1,3})\s*(?:chambres?|pièces?|rooms?|bedrooms?)", re.IGNORECASE)
+_BATHS_RE = re.compile(r"(?<!\d)(\d{1,3})\s*(?:sdb|salles? de bain|bathrooms?)", re.IGNORECASE)
+
+# Cleans a number captured by the patterns above in one pass: decimal commas become
+# dots, and the whitespace and apostrophes used as thousands separators are dropped
+_NUM_TABLE = str.maketrans({",": ".", "'": None, **{chr(c): None for c in range(0x3001) if chr(c).isspace()}})
+
+# Everything but the digits and decimal points of a price or area, stripped by clean_data
+_NON_NUMERIC_RE = re.compile(r'[^\d.]')
+
 # Helper functions
 def clean_text(text):
     """Clean text by removing extra spaces, newlines, etc."""
     if not text:
         return ""
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     return text.strip()
 
 def extract_number(text):
     """Extract numeric value from text"""
     if not text:
         return ""
-    matches = re.search(r'(\d[\d\s,.\']*)(?:\s*m²|\s*chambres?|\s*pièces?|\s*sdb)?', text.lower())
+    matches = _NUM_RE.search(text)
     if matches:
         num = matches.group(1)
         # Clean and standardize the number format
-        num = re.sub(r'[^\d.]', '', num.replace(',', '.'))
+        num = num.translate(_NUM_TABLE)
         return num
     return ""
 
@@ -185,11 +374,11 @@ def extract_price(text):
     if not text:
         return ""
     # Match price with various currency formats
-    matches = re.search(r'(\d[\d\s,.\']*)\s*(?:DT|TND|€|Dinar|Dinars)?', text)
+    matches = _NUM_RE.search(text)
     if matches:
         price = matches.group(1)
         # Clean and standardize the price format
-        price = re.sub(r'[^\d.]', '', price.replace(',', '.'))
+        price = price.translate(_NUM_TABLE)
         return price
     return ""
 
@@ -198,11 +387,11 @@ def extract_area(text):
     if not text:
         return ""
     # Match area with various formats
-    matches = re.search(r'(\d[\d\s,.\']*)\s*(?:m²|m2|mètres?|metres?)?', text.lower())
+    matches = _NUM_RE.search(text)
     if matches:
         area = matches.group(1)
         # Clean and standardize the area format
-        area = re.sub(r'[^\d.]', '', area.replace(',', '.'))
+        area = area.translate(_NUM_TABLE)
         return area
     return ""
 
@@ -211,7 +400,7 @@ def extract_bedrooms(text):
     if not text:
         return ""
     # Match bedrooms with various formats
-    matches = re.search(r'(\d+)\s*(?:chambres?|pièces?|rooms?|bedrooms?)', text.lower())
+    matches = _BEDS_RE.search(text)
     if matches:
         return matches.group(1)
     return ""
@@ -221,7 +410,7 @@ def extract_bathrooms(text):
     if not text:
         return ""
     # Match bathrooms with various formats
-    matches = re.search(r'(\d+)\s*(?:sdb|salles? de bain|bathrooms?)', text.lower())
+    matches = _BATHS_RE.search(text)
     if matches:
         return matches.group(1)
     return ""
@@ -230,57 +419,20 @@ def normalize_location(location):
     """Normalize location names in Tunisia"""
     location = location.lower().strip()
     
-    # Map of common location spelling variants to standardized names
-    location_map = {
-        # Tunis region
-        "tunis": "Tunis", 
-        "grand tunis": "Tunis",
-        "le grand tunis": "Tunis",
-        # Major cities
-        "ariana": "Ariana",
-        "l'ariana": "Ariana",
-        "ben arous": "Ben Arous",
-        "manouba": "Manouba",
-        "la manouba": "Manouba",
-        "sousse": "Sousse",
-        "nabeul": "Nabeul",
-        "monastir": "Monastir",
-        "sfax": "Sfax",
-        "hammamet": "Hammamet",
-        # Add more mappings as needed
-    }
-    
     # Check if location contains a known location
-    for key, value in location_map.items():
-        if key in location:
-            return value
+    match = _LOC_RE.search(location)
+    if match:
+        return LOCATION_MAP[match.group(1)]
     
     return location.title()  # Return title-cased version if no match
 
 def detect_property_type(title, description=""):
     """Detect property type from title and description"""
-    text = (title + " " + description).lower()
-    
-    if "appartement" in text:
-        return "Appartement"
-    elif "villa" in text:
-        return "Villa"
-    elif "maison" in text:
-        return "Maison"
-    elif "studio" in text:
-        return "Studio"
-    elif "duplex" in text:
-        return "Duplex"
-    elif "bureau" in text:
-        return "Bureau"
-    elif "local" in text:
-        return "Local Commercial"
-    elif "terrain" in text:
-        return "Terrain"
-    elif "ferme" in text:
-        return "Ferme"
-    else:
-        return "Autre"
+    # The title usually names the type, the description is only searched without a match
+    match = _PT_RE.search(title)
+    if description and not match:
+        match = _PT_RE.search(description)
+    return _PT_MAP[match.group(1).lower()] if match else "Autre"
 
 def get_domain_name(url):
     """Extract domain name from URL"""
@@ -290,55 +442,223 @@ def get_domain_name(url):
         domain = domain[4:]
     return domain
 
-def wait_with_random_delay(min_seconds=2, max_seconds=5):
+def wait_with_random_delay(min_seconds=_MIN_DELAY, max_seconds=_MAX_DELAY):
     """Wait for a random amount of time between min and max seconds"""
-    delay = min_seconds + (max_seconds - min_seconds) * random.random()
-    logger.info(f"Waiting for {delay:.2f} seconds...")
+    delay = random.uniform(min_seconds, max_seconds)
+    logger.debug("Waiting for %.2f seconds...", delay)
     time.sleep(delay)
 
+def new_scraper_context(browser):
+    """Create a browser context with the scraper's user agent and viewport, skipping heavy downloads"""
+    context = browser.new_context(
+        user_agent=USER_AGENT,
+        viewport={"width": 1366, "height": 900}
+    )
+    
+    # Skip the downloads the scraper never reads
+    context.route('**/*', block_heavy_resources)
+    return context
+
+def open_page(browser):
+    """
+    Open a page for a scrape
+    
+    Args:
+        browser: Playwright browser, or a browser context shared between sites
+        
+    Returns:
+        tuple: (page, context created for it, or None when a shared context was given)
+    """
+    # Only a Browser can create contexts
+    if hasattr(browser, "new_context"):
+        context = new_scraper_context(browser)
+        return context.new_page(), context
+    return browser.new_page(), None
+
+def close_page(page, own_context):
+    """Close a page opened by open_page, and the context created for it"""
+    if own_context:
+        own_context.close()
+    else:
+        page.close()
+
+def block_heavy_resources(route):
+    """Route handler aborting images, media, fonts and stylesheets
+    
+    HTML, XHR and scripts still load since some sites render their listings with JS;
+    image URLs are read from the src attributes, which don't need the download.
+    """
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+def wait_for_listings(page, ready_selector):
+    """Wait until a listing is in the page's DOM, then pause briefly to stay polite"""
+    try:
+        page.wait_for_selector(ready_selector, state="attached", timeout=LISTINGS_TIMEOUT)
+    except PlaywrightTimeoutError:
+        logger.warning(f"No listing appeared within {LISTINGS_TIMEOUT // 1000}s on {page.url}")
+    wait_with_random_delay()
+
+def is_new_property(property_data, seen_urls):
+    """Tell whether a property's listing URL wasn't seen yet, and remember it
+    
+    Properties without a listing URL can't be compared and always count as new.
+    """
+    url = property_data.get("listing_url")
+    if not url:
+        return True
+    if url in seen_urls:
+        return False
+    seen_urls.add(url)
+    return True
+
 def save_to_csv(data, output_file):
     """Save data to CSV file"""
     if not data:
         logger.warning(f"No data to save to {output_file}")
         return
     
-    # Get all field names from all properties
-    fieldnames = set()
-    for item in data:
-        for key in item.keys():
-            fieldnames.add(key)
-    
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=sorted(list(fieldnames)))
+    # Fixed columns: missing fields are left empty and unknown ones dropped
+    with open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction='ignore', restval='')
         writer.writeheader()
         writer.writerows(data)
     
     logger.info(f"Saved {len(data)} items to {output_file}")
 
+def save_to_parquet(data, output_file):
+    """Save data to a Parquet file (snappy), with the CSV columns"""
+    if not data:
+        logger.warning(f"No data to save to {output_file}")
+        return
+    
+    # Scraped values are text, except the page number
+    df = pd.DataFrame(data, columns=FIELDNAMES)
+    df = df.astype({field: "string" for field in FIELDNAMES if field != "page_number"})
+    df.to_parquet(output_file, compression='snappy', index=False)
+    
+    logger.info(f"Saved {len(data)} items to {output_file}")
+
+def numpy_to_builtin(obj):
+    """json default hook converting NumPy types, only needed without orjson"""
+    if isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dump_json_line(item):
+    """Serialize an item as one UTF-8 encoded NDJSON line"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(item, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+    return (json.dumps(item, ensure_ascii=False, default=numpy_to_builtin) + "\n").encode('utf-8')
+
 def save_to_json(data, output_file):
     """Save data to JSON file with handling for NumPy types"""
-    class NumpyEncoder(json.JSONEncoder):
-        """Custom encoder for NumPy data types"""
-        def default(self, obj):
-            if isinstance(obj, (np.integer, np.int64)):
-                return int(obj)
-            elif isinstance(obj, (np.floating, np.float64)):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            return super(NumpyEncoder, self).default(obj)
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2, cls=NumpyEncoder)
+    if ORJSON_AVAILABLE:
+        # orjson serializes NumPy scalars and arrays natively
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2, default=numpy_to_builtin).encode('utf-8')
+    
+    with open(output_file, 'wb') as f:
+        f.write(payload)
     logger.info(f"Saved {len(data)} items to {output_file}")
 
+def get_extract_config(site_config):
+    """Return the field selectors of a site in the form EXTRACT_PROPERTY_SCRIPT expects
+    
+    Each field maps to a list of [css, text] pairs, text being the lowercased
+    :has-text() argument or None. Built once per site and kept in its config
+    (at import for SITE_CONFIGS).
+    """
+    extract_config = site_config.get("_extract_config")
+    if extract_config is None:
+        extract_config = site_config["_extract_config"] = {
+            field: to_selector_pairs(site_config.get(f"{field}_selectors", []))
+            for field in EXTRACT_FIELDS
+        }
+    return extract_config
+
+def get_pagination_config(site_config):
+    """Return the site's pagination selectors as FIND_NEXT_PAGE_SCRIPT expects, kept in its config"""
+    pagination_config = site_config.get("_pagination_config")
+    if pagination_config is None:
+        pagination_config = site_config["_pagination_config"] = to_selector_pairs(site_config.get("pagination_selectors", []))
+    return pagination_config
+
+def to_selector_pairs(selectors):
+    """Turn Playwright selectors into [css, text] pairs, text being the lowercased :has-text() argument or None"""
+    pairs = []
+    for selector in selectors:
+        has_text = _HAS_TEXT_RE.match(selector)
+        if has_text:
+            pairs.append([has_text.group(1) or "*", has_text.group(3).lower()])
+        else:
+            pairs.append([selector, None])
+    return pairs
+
+def load_remax_helpers():
+    """
+    Resolve the Remax helper functions once per scrape
+    
+    Returns:
+        tuple: (property extraction function, hash pagination function or None
+               when no pagination module is found and the URLs are built inline)
+    """
+    try:
+        from remax_helper_updated import extract_remax_property_data
+        logger.info("Using remax_helper_updated.py for property extraction")
+    except ImportError:
+        try:
+            from remax_helper import extract_remax_property_data
+            logger.info("Using remax_helper.py for property extraction")
+        except ImportError:
+            # Fallback to standard extraction
+            logger.warning("No Remax helper modules found, using standard property extraction")
+            extract_remax_property_data = extract_property
+    
+    try:
+        from remax_helper_updated import handle_remax_hash_pagination
+        logger.info("Using remax_helper_updated.py for hash pagination")
+    except ImportError:
+        try:
+            from remax_helper import handle_remax_hash_pagination
+            logger.info("Using remax_helper.py for hash pagination")
+        except ImportError:
+            try:
+                from remax_hash_pagination import handle_remax_hash_pagination
+                logger.info("Using remax_hash_pagination.py")
+            except ImportError:
+                logger.warning("No Remax hash pagination module found, using inline implementation")
+                handle_remax_hash_pagination = None
+    
+    return extract_remax_property_data, handle_remax_hash_pagination
+
+def get_property_css(site_config):
+    """Return the site's property selectors joined into one CSS selector list, kept in its config"""
+    property_css = site_config.get("_property_css")
+    if property_css is None:
+        property_css = site_config["_property_css"] = ", ".join(site_config["property_selectors"])
+    return property_css
+
+# The configured sites never change: build their selector data once, at import
+for _site_config in SITE_CONFIGS:
+    get_property_css(_site_config)
+    get_extract_config(_site_config)
+    get_pagination_config(_site_config)
+
 def scrape_remax_site(config, browser, all_properties):
     """
     Specialized scraper for Remax.com.tn with hash-based URL pagination
     
     Args:
         config (dict): Site configuration for Remax
-        browser: Playwright browser instance
+        browser: Playwright browser instance, or a browser context shared between sites
         all_properties (list): List of all properties collected so far
         
     Returns:
@@ -350,16 +670,20 @@ def scrape_remax_site(config, browser, all_properties):
     
     logger.info(f"\n{'='*80}\nStarting specialized scraping of {site_name} at URL: {base_url}\n{'='*80}")
     site_properties = []
+    seen_urls = set()
+    extract_remax_property_data, handle_remax_hash_pagination = load_remax_helpers()
     
-    context = browser.new_context(
-        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
-        viewport={"width": 1366, "height": 900}
-    )
+    # Names derived from the site's domain, computed once
+    domain = get_domain_name(base_url)
+    screenshot_folder = os.path.join(SCREENSHOTS_FOLDER, domain)
+    html_prefix = os.path.join(HTML_DUMPS_FOLDER, domain)
     
-    # Enable request interception
-    context.route('**/*', lambda route: route.continue_())
+    page, own_context = open_page(browser)
     
-    page = context.new_page()
+    # Every property is appended to the site's NDJSON file as soon as it is extracted,
+    # so a crash keeps what was already scraped
+    ndjson_path = os.path.join(RAW_DATA_FOLDER, f"{domain}_{TIMESTAMP}.ndjson")
+    ndjson_file = open(ndjson_path, "wb")
     
     try:
         # Configure longer timeouts for page operations
@@ -368,45 +692,31 @@ def scrape_remax_site(config, browser, all_properties):
         # Navigate to the initial page
         logger.info(f"Navigating to {base_url}")
         page.goto(base_url, wait_until="domcontentloaded")
-        wait_with_random_delay(5, 8)
+        wait_for_listings(page, REMAX_PROPERTY_SELECTOR)
         
         # Get the current URL after initial navigation
         current_url = page.url
         
         # Ensure we have the right hash in the URL for the first page
-        try:
-            # Try to import the specialized hash pagination function
-            try:
-                from remax_helper_updated import handle_remax_hash_pagination
-                logger.info("Using remax_helper_updated.py for hash pagination")
-            except ImportError:
-                try:
-                    from remax_helper import handle_remax_hash_pagination
-                    logger.info("Using remax_helper.py for hash pagination")
-                except ImportError:
-                    from remax_hash_pagination import handle_remax_hash_pagination
-                    logger.info("Using remax_hash_pagination.py")
-            
+        if handle_remax_hash_pagination:
             # If the URL doesn't have a hash, add the default hash for page 1
             if "#" not in current_url:
                 hash_url = handle_remax_hash_pagination(base_url, 1)
                 logger.info(f"Setting initial hash URL: {hash_url}")
                 page.goto(hash_url, wait_until="domcontentloaded")
-                wait_with_random_delay(3, 5)
-        except ImportError:
-            logger.warning("No Remax hash pagination module found, using inline implementation")
+                wait_for_listings(page, REMAX_PROPERTY_SELECTOR)
+        else:
             # Inline implementation if modules can't be imported
             if "#" not in current_url:
                 # Create default hash URL for page 1
-                hash_url = f"{base_url}#mode=gallery&tt=261&cur=TND&sb=MostRecent&page=1&sc=1048"
+                hash_url = f"{base_url}#{REMAX_DEFAULT_HASH.format(page=1)}"
                 logger.info(f"Setting default hash URL: {hash_url}")
                 page.goto(hash_url, wait_until="domcontentloaded")
-                wait_with_random_delay(3, 5)
+                wait_for_listings(page, REMAX_PROPERTY_SELECTOR)
         
         # Set up screenshot folder
-        domain = get_domain_name(base_url)
-        screenshot_folder = os.path.join(SCREENSHOTS_FOLDER, domain)
-        os.makedirs(screenshot_folder, exist_ok=True)
+        if DEBUG:
+            os.makedirs(screenshot_folder, exist_ok=True)
         
         # Start scraping pages
         page_count = 1
@@ -414,45 +724,49 @@ def scrape_remax_site(config, browser, all_properties):
         while page_count <= max_pages:
             logger.info(f"Processing {site_name} page {page_count}")
             
-            # Take a screenshot for debugging
-            screenshot_path = os.path.join(screenshot_folder, f"page_{page_count}_{TIMESTAMP}.png")
-            page.screenshot(path=screenshot_path)
-            
-            # Save the HTML source for debugging
-            html_path = os.path.join(HTML_DUMPS_FOLDER, f"{domain}_page_{page_count}_{TIMESTAMP}.html")
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(page.content())
+            if DEBUG:
+                # Take a screenshot for debugging
+                screenshot_path = os.path.join(screenshot_folder, f"page_{page_count}_{TIMESTAMP}.jpg")
+                page.screenshot(path=screenshot_path, type="jpeg", quality=50)
+                
+                # Save the HTML source for debugging
+                html_path = f"{html_prefix}_page_{page_count}_{TIMESTAMP}.html"
+                with open(html_path, "w", encoding="utf-8") as f:
+                    f.write(page.content())
                 
             # Get the current URL with hash
             current_url = page.url
             logger.info(f"Current URL: {current_url}")
               # Extract properties from the current page
-            property_elements = page.query_selector_all(".gallery-item, .propertyListItem, .property-item, .listingGridBox, .property-container, .listing-item")
+            property_elements = page.query_selector_all(REMAX_PROPERTY_SELECTOR)
             logger.info(f"Found {len(property_elements)} property elements on page {page_count}")
             
             # Process each property
+            duplicates = 0
             for property_item in property_elements:
                 try:
-                    # Attempt to use specialized Remax property extraction
-                    try:
-                        try:
-                            from remax_helper_updated import extract_remax_property_data
-                            logger.info("Using remax_helper_updated.py for property extraction")
-                            property_data = extract_remax_property_data(property_item, config, site_name, page_count)
-                        except ImportError:
-                            from remax_helper import extract_remax_property_data
-                            logger.info("Using remax_helper.py for property extraction")
-                            property_data = extract_remax_property_data(property_item, config, site_name, page_count)
-                    except ImportError:
-                        # Fallback to standard extraction
-                        logger.warning("No Remax helper modules found, using standard property extraction")
-                        property_data = extract_property(property_item, config, site_name, page_count)
+                    # Specialized Remax property extraction when a helper module is available
+                    property_data = extract_remax_property_data(property_item, config, site_name, page_count)
+                    
+                    # Skip listings already collected from an earlier page
+                    if not is_new_property(property_data, seen_urls):
+                        duplicates += 1
+                        continue
                     
                     # Add property to list
                     site_properties.append(property_data)
                     all_properties.append(property_data)
+                    ndjson_file.write(dump_json_line(property_data))
                 except Exception as e:
                     logger.error(f"Error extracting property data on {site_name} page {page_count}: {e}")
+                finally:
+                    # The page keeps every handle alive until the context closes, release it now
+                    property_item.dispose()
+            
+            # A page with nothing but known listings means the pagination has wrapped around
+            if property_elements and duplicates == len(property_elements):
+                logger.info(f"No new properties on page {page_count}, stopping")
+                break
             
             # Check if we've reached the maximum number of pages
             if page_count >= max_pages:
@@ -461,38 +775,18 @@ def scrape_remax_site(config, browser, all_properties):
             
             # Generate URL for next page using hash-based pagination
             next_page_num = page_count + 1
-            try:
-                try:
-                    from remax_helper_updated import handle_remax_hash_pagination
-                    next_url = handle_remax_hash_pagination(current_url, next_page_num)
-                except ImportError:
-                    try:
-                        from remax_helper import handle_remax_hash_pagination
-                        next_url = handle_remax_hash_pagination(current_url, next_page_num)
-                    except ImportError:
-                        from remax_hash_pagination import handle_remax_hash_pagination
-                        next_url = handle_remax_hash_pagination(current_url, next_page_num)
-            except ImportError:
+            if handle_remax_hash_pagination:
+                next_url = handle_remax_hash_pagination(current_url, next_page_num)
+            else:
                 # Fallback to inline hash URL generation
                 if "#" in current_url:
-                    base_url, hash_part = current_url.split('#', 1)
-                    
-                    # If hash already has page parameter, update it
-                    if "page=" in hash_part:
-                        parts = []
-                        for param in hash_part.split('&'):
-                            if param.startswith("page="):
-                                parts.append(f"page={next_page_num}")
-                            else:
-                                parts.append(param)
-                        new_hash = '&'.join(parts)
-                        next_url = f"{base_url}#{new_hash}"
-                    else:
-                        # Add page parameter to existing hash
+                    # If hash already has page parameter, update it, else add one
+                    next_url, replaced = _PAGE_PARAM_RE.subn(f"page={next_page_num}", current_url)
+                    if not replaced:
                         next_url = f"{current_url}&page={next_page_num}"
                 else:
                     # Create default hash URL
-                    next_url = f"{base_url}#mode=gallery&tt=261&cur=TND&sb=MostRecent&page={next_page_num}&sc=1048"
+                    next_url = f"{base_url}#{REMAX_DEFAULT_HASH.format(page=next_page_num)}"
             
             logger.info(f"Navigating to next page: {next_url}")
             
@@ -500,8 +794,8 @@ def scrape_remax_site(config, browser, all_properties):
             page.goto(next_url, wait_until="domcontentloaded")
             page_count += 1
             
-            # Wait for the page to load with random delay to appear more human-like
-            wait_with_random_delay(3, 6)
+            # Wait for the listings to load, with a short random pause to appear more human-like
+            wait_for_listings(page, REMAX_PROPERTY_SELECTOR)
     
     except Exception as e:
         logger.error(f"Error during {site_name} specialized scraping: {e}")
@@ -509,13 +803,13 @@ def scrape_remax_site(config, browser, all_properties):
         logger.error(traceback.format_exc())
     
     finally:
-        # Close context
-        context.close()
+        # Close the page, its context if it was created here, and the NDJSON stream
+        close_page(page, own_context)
+        ndjson_file.close()
     
     logger.info(f"{site_name} specialized scraping completed. Total properties collected: {len(site_properties)}")
     
     # Save the data for this site
-    domain = get_domain_name(base_url)
     output_file = os.path.join(RAW_DATA_FOLDER, f"{domain}_{TIMESTAMP}.csv")
     save_to_csv(site_properties, output_file)
     
@@ -523,23 +817,6 @@ def scrape_remax_site(config, browser, all_properties):
     json_output = os.path.join(RAW_DATA_FOLDER, f"{domain}_{TIMESTAMP}.json")
     save_to_json(site_properties, json_output)
     
-    # Save data for each page
-    page_data_dir = os.path.join(RAW_DATA_FOLDER, f"{domain}_pages_{TIMESTAMP}")
-    os.makedirs(page_data_dir, exist_ok=True)
-    
-    # Group properties by page number
-    page_properties = {}
-    for prop in site_properties:
-        page_num = prop.get("page_number", 0)
-        if page_num not in page_properties:
-            page_properties[page_num] = []
-        page_properties[page_num].append(prop)
-    
-    # Save each page's data separately
-    for page_num, props in page_properties.items():
-        page_file = os.path.join(page_data_dir, f"page_{page_num}.json")
-        save_to_json(props, page_file)
-    
     return site_properties
 
 def extract_property(property_item, site_config, site_name, page_count):
@@ -561,114 +838,176 @@ def extract_property(property_item, site_config, site_name, page_count):
     }
     
     try:
-        # Title
-        for selector in site_config.get("title_selectors", []):
-            title_element = property_item.query_selector(selector)
-            if title_element:
-                property_data["title"] = title_element.text_content().strip()
-                break
-        
-        # Price
-        for selector in site_config.get("price_selectors", []):
-            price_element = property_item.query_selector(selector)
-            if price_element:
-                property_data["price"] = price_element.text_content().strip()
-                property_data["raw_price"] = property_data["price"]
-                break
-        
-        # Location
-        for selector in site_config.get("location_selectors", []):
-            location_element = property_item.query_selector(selector)
-            if location_element:
-                property_data["location"] = location_element.text_content().strip()
-                break
-        
-        # Area
-        for selector in site_config.get("area_selectors", []):
-            area_element = property_item.query_selector(selector)
-            if area_element:
-                property_data["area"] = area_element.text_content().strip()
-                property_data["raw_area"] = property_data["area"]
-                break
-        
-        # Bedrooms
-        for selector in site_config.get("bedrooms_selectors", []):
-            bedrooms_element = property_item.query_selector(selector)
-            if bedrooms_element:
-                property_data["bedrooms"] = bedrooms_element.text_content().strip()
-                break
-        
-        # Bathrooms
-        for selector in site_config.get("bathrooms_selectors", []):
-            bathrooms_element = property_item.query_selector(selector)
-            if bathrooms_element:
-                property_data["bathrooms"] = bathrooms_element.text_content().strip()
-                break
-        
-        # Features
-        for selector in site_config.get("features_selectors", []):
-            features_element = property_item.query_selector(selector)
-            if features_element:
-                property_data["features"] = features_element.text_content().strip()
-                break
-        
-        # Image URL
-        img_element = property_item.query_selector("img")
-        if img_element:
-            property_data["image_url"] = img_element.get_attribute("src")
-        
-        # Listing URL
-        url_element = property_item.query_selector("a")
-        if url_element:
-            property_data["listing_url"] = url_element.get_attribute("href")
+        # All the fields are read in the page in one round-trip
+        property_data.update(property_item.evaluate(EXTRACT_PROPERTY_SCRIPT, get_extract_config(site_config)))
+        if "price" in property_data:
+            property_data["raw_price"] = property_data["price"]
+        if "area" in property_data:
+            property_data["raw_area"] = property_data["area"]
         
     except Exception as e:
         logger.error(f"Error extracting basic property data: {e}")
     
     return property_data
 
-def scrape_properties(config, browser, all_properties):
+def build_property(data, site_name, page_count):
+    """Complete the fields extracted for a property with its source and raw values"""
+    property_data = {"source_site": site_name, "page_number": page_count, **data}
+    if "price" in property_data:
+        property_data["raw_price"] = property_data["price"]
+    if "area" in property_data:
+        property_data["raw_area"] = property_data["area"]
+    return property_data
+
+def extract_page_properties(page, site_config, site_name, page_count):
     """
-    Standard scraper for most sites that don't require special handling
+    Extract every property of a listing page in one round-trip, as extract_property
+    does for a single element
     
-    Args:
-        config (dict): Site configuration
-        browser: Playwright browser instance
-        all_properties (list): List of all properties collected so far
+    Returns:
+        list: Property data, empty if the page couldn't be read
+    """
+    try:
+        properties = page.evaluate(EXTRACT_PAGE_SCRIPT, [get_property_css(site_config), get_extract_config(site_config)])
+    except Exception as e:
+        logger.error(f"Error extracting property data from {page.url}: {e}")
+        return []
+    
+    return [build_property(data, site_name, page_count) for data in properties]
+
+def first_match_html(root, selector_pairs):
+    """selectolax counterpart of FIRST_MATCH_JS: first node under root matched by the [css, text] pairs, in order"""
+    for css, text in selector_pairs:
+        try:
+            if text is None:
+                node = root.css_first(css)
+            else:
+                node = next((n for n in root.css(css) if text in n.text().lower()), None)
+        except Exception:
+            continue  # Selector lexbor can't parse
+        if node is not None:
+            return node
+    return None
+
+def parse_page_properties(tree, site_config, site_name, page_count):
+    """Extract every property of a listing page's parsed HTML, with the same rules as EXTRACT_PAGE_SCRIPT"""
+    # The site's selectors are bound once for the whole page
+    field_selectors = list(get_extract_config(site_config).items())
+    
+    page_properties = []
+    for element in tree.css(get_property_css(site_config)):
+        data = {}
+        for field, selector_pairs in field_selectors:
+            node = first_match_html(element, selector_pairs)
+            if node is not None:
+                data[field] = node.text().strip()
+        
+        img = element.css_first("img")
+        if img is not None:
+            data["image_url"] = img.attributes.get("src")
+        
+        link = element.css_first("a")
+        if link is not None:
+            data["listing_url"] = link.attributes.get("href")
         
+        page_properties.append(build_property(data, site_name, page_count))
+    return page_properties
+
+def find_next_page_url(tree, site_config, page_url):
+    """
+    Find the next page link of a listing page's parsed HTML
+    
     Returns:
-        list: Properties found on the site
+        str or None: Absolute URL of the next page, "" when the link can only be
+                     followed with JavaScript, None when there is no next page link
+    """
+    link = first_match_html(tree, get_pagination_config(site_config))
+    if link is None:
+        return None
+    href = (link.attributes.get("href") or "").strip()
+    if not href or href.startswith(("#", "javascript:")):
+        return ""
+    return urljoin(page_url, href)
+
+def scrape_pages_http(config, collect):
+    """
+    Scrape a site's listing pages with plain HTTP requests, without a browser
+    
+    Used for the sites whose listings are in the served HTML ("static_html" in their
+    config). Returns False, before collecting anything, when the first page can't be
+    fetched, has no properties in its HTML or needs JavaScript to paginate, so the
+    caller can fall back to the browser.
     """
     site_name = config["name"]
-    base_url = config["base_url"]
     max_pages = config.get("max_pages", 20)
+    url = config["base_url"]
     
-    logger.info(f"\n{'='*80}\nStarting scraping of {site_name} at URL: {base_url}\n{'='*80}")
-    site_properties = []
-    
-    context = browser.new_context(
-        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
-        viewport={"width": 1366, "height": 900}
-    )
+    with httpx.Client(headers={"User-Agent": USER_AGENT}, timeout=20, follow_redirects=True) as client:
+        page_count = 1
+        while page_count <= max_pages:
+            logger.info(f"Fetching {site_name} page {page_count}: {url}")
+            try:
+                response = client.get(url)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.error(f"Error fetching {site_name} page {page_count}: {e}")
+                return page_count > 1
+            
+            tree = LexborHTMLParser(response.text)
+            page_properties = parse_page_properties(tree, config, site_name, page_count)
+            next_page_url = find_next_page_url(tree, config, str(response.url))
+            
+            if page_count == 1 and (not page_properties or next_page_url == ""):
+                logger.info(f"The HTML served by {site_name} isn't enough to scrape it, falling back to the browser")
+                return False
+            
+            logger.info(f"Found {len(page_properties)} property elements on page {page_count}")
+            
+            # A page with nothing but known listings means the pagination has wrapped around
+            if page_properties and not collect(page_properties):
+                logger.info(f"No new properties on page {page_count}, stopping")
+                break
+            
+            # Check if there's a next page
+            if page_count >= max_pages:
+                logger.info(f"Reached maximum pages ({max_pages})")
+                break
+            
+            if not next_page_url:
+                logger.info(f"No next page link found, stopping at page {page_count}")
+                break
+            
+            url = next_page_url
+            page_count += 1
+            
+            # Wait a little between requests to be considerate
+            wait_with_random_delay(1, 2)
     
-    # Enable request interception (useful for some sites with anti-bot measures)
-    context.route('**/*', lambda route: route.continue_())
+    return True
+
+def scrape_pages_browser(config, browser, collect):
+    """Scrape a site's listing pages in the browser, following its next page links"""
+    site_name = config["name"]
+    base_url = config["base_url"]
+    max_pages = config.get("max_pages", 20)
+    property_selectors = get_property_css(config)
+    screenshot_folder = os.path.join(SCREENSHOTS_FOLDER, get_domain_name(base_url))
     
-    page = context.new_page()
+    page, own_context = open_page(browser)
     
     try:
         # Configure longer timeouts for page operations
         page.set_default_timeout(120000)  # 2 minutes
         
-        # Navigate to the initial page
+        # Navigate to the initial page, waiting for the first listing rather than the whole document;
+        # the scroll pause below leaves the rest of the page time to arrive before extraction
         logger.info(f"Navigating to {base_url}")
-        page.goto(base_url, wait_until="domcontentloaded")
-        wait_with_random_delay(5, 8)
+        page.goto(base_url, wait_until="commit")
+        wait_for_listings(page, property_selectors)
         
         # Set up screenshot folder
-        domain = get_domain_name(base_url)
-        screenshot_folder = os.path.join(SCREENSHOTS_FOLDER, domain)
-        os.makedirs(screenshot_folder, exist_ok=True)
+        if DEBUG:
+            os.makedirs(screenshot_folder, exist_ok=True)
         
         # Start scraping pages
         page_count = 1
@@ -676,74 +1015,123 @@ def scrape_properties(config, browser, all_properties):
             logger.info(f"Processing {site_name} page {page_count}")
             
             # Take screenshot for debugging
-            screenshot_path = os.path.join(screenshot_folder, f"page_{page_count}_{TIMESTAMP}.png")
-            page.screenshot(path=screenshot_path)
+            if DEBUG:
+                screenshot_path = os.path.join(screenshot_folder, f"page_{page_count}_{TIMESTAMP}.jpg")
+                page.screenshot(path=screenshot_path, type="jpeg", quality=50)
             
             # Scroll page to ensure all content is loaded
             page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            wait_with_random_delay(2, 4)
+            wait_with_random_delay(1, 2)
             
-            # Extract properties from the current page
-            property_selectors = ", ".join(config["property_selectors"])
-            property_elements = page.query_selector_all(property_selectors)
+            # Extract all available information of the page's properties at once
+            page_properties = extract_page_properties(page, config, site_name, page_count)
             
-            logger.info(f"Found {len(property_elements)} property elements on page {page_count}")
+            logger.info(f"Found {len(page_properties)} property elements on page {page_count}")
             
-            # Process each property
-            for property_item in property_elements:
-                try:
-                    # Extract all available property information
-                    property_data = extract_property(property_item, config, site_name, page_count)
-                    site_properties.append(property_data)
-                    all_properties.append(property_data)
-                except Exception as e:
-                    logger.error(f"Error extracting property data on {site_name} page {page_count}: {e}")
-            
-            # Save progress for this site
-            output_file = os.path.join(RAW_DATA_FOLDER, f"{domain}_{TIMESTAMP}_page{page_count}.csv")
-            save_to_csv(site_properties, output_file)
+            # A page with nothing but known listings means the pagination has wrapped around
+            if page_properties and not collect(page_properties):
+                logger.info(f"No new properties on page {page_count}, stopping")
+                break
             
             # Check if there's a next page
             if page_count >= max_pages:
                 logger.info(f"Reached maximum pages ({max_pages})")
                 break
             
-            # Look for pagination link
-            pagination_selectors = config.get("pagination_selectors", [])
+            # Look for pagination link, the candidates of every pagination selector being
+            # collected in one query and clicked in order until one works
+            candidates = page.evaluate_handle(FIND_NEXT_PAGE_SCRIPT, get_pagination_config(config))
+            next_page_links = [prop.as_element() for prop in candidates.get_properties().values()]
+            candidates.dispose()
             next_page_found = False
             
-            for selector in pagination_selectors:
-                next_page_link = page.query_selector(selector)
-                if next_page_link:
-                    logger.info(f"Found next page link with selector: {selector}")
-                    try:
-                        next_page_link.click()
-                        next_page_found = True
-                        logger.info(f"Clicked next page link, waiting for load...")
-                        page.wait_for_load_state("domcontentloaded")
-                        wait_with_random_delay(5, 8)
-                        break
-                    except Exception as e:
-                        logger.error(f"Error clicking next page link: {e}")
+            for next_page_link in filter(None, next_page_links):
+                logger.info("Found next page link")
+                try:
+                    next_page_link.click()
+                    next_page_found = True
+                    logger.info(f"Clicked next page link, waiting for load...")
+                    page.wait_for_load_state("domcontentloaded")
+                    wait_for_listings(page, property_selectors)
+                    break
+                except Exception as e:
+                    logger.error(f"Error clicking next page link: {e}")
             
             if not next_page_found:
                 logger.info(f"No next page link found, stopping at page {page_count}")
                 break
             
             page_count += 1
+    
+    finally:
+        # Close the page, and its context if it was created here
+        close_page(page, own_context)
+
+def scrape_properties(config, browser, all_properties):
+    """
+    Standard scraper for most sites that don't require special handling
+    
+    Sites marked "static_html" are first scraped over plain HTTP, the browser
+    being the fallback when their served HTML isn't enough.
+    
+    Args:
+        config (dict): Site configuration
+        browser: Playwright browser instance, or a browser context shared between sites
+        all_properties (list): List of all properties collected so far
+        
+    Returns:
+        list: Properties found on the site
+    """
+    site_name = config["name"]
+    base_url = config["base_url"]
+    
+    logger.info(f"\n{'='*80}\nStarting scraping of {site_name} at URL: {base_url}\n{'='*80}")
+    site_properties = []
+    seen_urls = set()
+    
+    # Names derived from the site's domain, computed once
+    domain = get_domain_name(base_url)
+    
+    # Properties are written to the site's CSV as they are extracted, and flushed
+    # every CSV_FLUSH_ROWS rows
+    full_output_file = os.path.join(RAW_DATA_FOLDER, f"{domain}_{TIMESTAMP}_full.csv")
+    csv_file = open(full_output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20)
+    csv_writer = csv.DictWriter(csv_file, fieldnames=FIELDNAMES, extrasaction='ignore', restval='')
+    csv_writer.writeheader()
+    
+    def collect(page_properties):
+        """Keep a page's properties not collected yet, returning how many there were"""
+        new_count = 0
+        for property_data in page_properties:
+            # Skip listings already collected from an earlier page
+            if not is_new_property(property_data, seen_urls):
+                continue
+            
+            new_count += 1
+            site_properties.append(property_data)
+            all_properties.append(property_data)
+            csv_writer.writerow(property_data)
+            if len(site_properties) % CSV_FLUSH_ROWS == 0:
+                csv_file.flush()
+        return new_count
+    
+    try:
+        # Plain HTTP needs selectolax to parse the pages; the browser stays the fallback
+        scraped = False
+        if config.get("static_html") and HTTPX_AVAILABLE and SELECTOLAX_AVAILABLE:
+            scraped = scrape_pages_http(config, collect)
+        if not scraped:
+            scrape_pages_browser(config, browser, collect)
             
     except Exception as e:
         logger.error(f"Error during {site_name} scraping: {e}")
     
     finally:
-        # Close context when done
-        context.close()
+        # Close the site's CSV
+        csv_file.close()
     
     logger.info(f"{site_name} scraping completed. Total properties collected: {len(site_properties)}")
-    
-    # Save the full data for this site
-    full_output_file = os.path.join(RAW_DATA_FOLDER, f"{domain}_{TIMESTAMP}_full.csv")
-    save_to_csv(site_properties, full_output_file)
+    logger.info(f"Saved {len(site_properties)} items to {full_output_file}")
     
     # Also save as JSON
     json_output = os.path.join(RAW_DATA_FOLDER, f"{domain}_{TIMESTAMP}_full.json")
@@ -756,7 +1144,7 @@ def scrape_tecnocasa_regions(browser, all_properties):
     Special handler for Tecnocasa regional websites
     
     Args:
-        browser: Playwright browser instance
+        browser: Playwright browser instance, or a browser context shared between sites
         all_properties: List of all properties collected so far
         
     Returns:
@@ -765,12 +1153,20 @@ def scrape_tecnocasa_regions(browser, all_properties):
     logger.info(f"Starting Tecnocasa regional scraping...")
     tecnocasa_properties = []
     
-    # Create context with appropriate settings
-    context = browser.new_context(
-        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
-        viewport={"width": 1366, "height": 900}
-    )
-    page = context.new_page()
+    # Extract properties using selectors from Tecnocasa config, looked up before any page is opened
+    tecnocasa_config = next((cfg for cfg in SITE_CONFIGS if cfg["name"] == "tecnocasa.tn"), None)
+    if not tecnocasa_config:
+        logger.error("Tecnocasa configuration not found, skipping regions")
+        return tecnocasa_properties
+    property_selectors = get_property_css(tecnocasa_config)
+    
+    # The regions overlap each other and tecnocasa.tn: listings already collected are skipped
+    seen_urls = {
+        property_data["listing_url"] for property_data in list(all_properties)
+        if property_data.get("source_site") == "tecnocasa.tn" and property_data.get("listing_url")
+    }
+    
+    page, own_context = open_page(browser)
     
     try:
         for idx, region_url in enumerate(TECNOCASA_REGIONS):
@@ -779,33 +1175,19 @@ def scrape_tecnocasa_regions(browser, all_properties):
             
             # Navigate to region page
             page.goto(region_url, wait_until="domcontentloaded")
-            wait_with_random_delay(5, 8)
+            wait_for_listings(page, property_selectors)
             
-            # Extract properties using selectors from Tecnocasa config
-            tecnocasa_config = next((cfg for cfg in SITE_CONFIGS if cfg["name"] == "tecnocasa.tn"), None)
+            # Extract properties from the current region page, all in one round-trip
+            page_properties = extract_page_properties(page, tecnocasa_config, "tecnocasa.tn", 1)
+            region_properties = [property_data for property_data in page_properties if is_new_property(property_data, seen_urls)]
             
-            if not tecnocasa_config:
-                logger.error("Tecnocasa configuration not found, skipping regions")
-                break
-            
-            # Extract properties from the current region page
-            property_selectors = ", ".join(tecnocasa_config["property_selectors"])
-            property_elements = page.query_selector_all(property_selectors)
-            
-            logger.info(f"Found {len(property_elements)} property elements in region: {region_name}")
+            logger.info(f"Found {len(page_properties)} property elements in region: {region_name}, {len(region_properties)} new")
             
             # Process each property
-            region_properties = []
-            for property_item in property_elements:
-                try:
-                    # Extract property data
-                    property_data = extract_property(property_item, tecnocasa_config, "tecnocasa.tn", 1)
-                    property_data["region"] = region_name
-                    region_properties.append(property_data)
-                    tecnocasa_properties.append(property_data)
-                    all_properties.append(property_data)
-                except Exception as e:
-                    logger.error(f"Error extracting property data for region {region_name}: {e}")
+            for property_data in region_properties:
+                property_data["region"] = region_name
+                tecnocasa_properties.append(property_data)
+                all_properties.append(property_data)
             
             # Save progress for this region
             region_file = f"tecnocasa_{region_name.lower().replace(' ', '_')}_{TIMESTAMP}.csv"
@@ -822,8 +1204,8 @@ def scrape_tecnocasa_regions(browser, all_properties):
         logger.error(f"Error during Tecnocasa regional scraping: {e}")
     
     finally:
-        # Close context when done
-        context.close()
+        # Close the page, and its context if it was created here
+        close_page(page, own_context)
     
     logger.info(f"Tecnocasa regional scraping completed. Added {len(tecnocasa_properties)} properties")
     
@@ -834,12 +1216,20 @@ def scrape_tecnocasa_regions(browser, all_properties):
     
     return tecnocasa_properties
 
+def iqr_bounds(values, k=3):
+    """Return the (low, high) bounds of an IQR outlier filter on an array, ignoring NaN"""
+    if np.isnan(values).all():
+        return np.nan, np.nan
+    q1, q3 = np.nanquantile(values, [0.25, 0.75])
+    iqr = q3 - q1
+    return q1 - k * iqr, q3 + k * iqr
+
 def clean_data(input_file):
     """
     Clean and normalize property data
     
     Args:
-        input_file (str): Path to input CSV file
+        input_file (str): Path to input CSV or Parquet file
         
     Returns:
         tuple: (cleaned DataFrame, statistics dictionary)
@@ -848,7 +1238,16 @@ def clean_data(input_file):
     
     try:
         # Read the raw data
-        df = pd.read_csv(input_file, encoding='utf-8')
+        if input_file.endswith(".parquet"):
+            df = pd.read_parquet(input_file)
+        elif PYARROW_AVAILABLE:
+            # Multithreaded parsing into Arrow-backed columns instead of Python strings
+            df = pd.read_csv(input_file, encoding='utf-8', engine='pyarrow', dtype_backend='pyarrow')
+        else:
+            df = pd.read_csv(input_file, encoding='utf-8')
+        
+        # A handful of sites repeated on every row
+        df["source_site"] = df["source_site"].astype("category")
         logger.info(f"Read {len(df)} properties from {input_file}")
         
         # Statistics before cleaning
@@ -866,33 +1265,25 @@ def clean_data(input_file):
         stats["removed_missing_essential"] = len(df) - len(df_filtered)
         
         # 2. Extract numeric values from price and area
-        def extract_numeric(value):
-            if pd.isna(value):
-                return np.nan
-            numeric_part = re.sub(r'[^\d.]', '', str(value).replace(',', '.'))
-            try:
-                return float(numeric_part) if numeric_part else np.nan
-            except:
-                return np.nan
+        def extract_numeric(values):
+            # Whole column at once: keep the digits and decimal points, anything
+            # that isn't a number afterwards (missing, empty, "1.2.3") becomes NaN
+            numeric_part = values.astype(str).str.replace(',', '.', regex=False).str.replace(_NON_NUMERIC_RE, '', regex=True)
+            return pd.to_numeric(numeric_part, errors='coerce')
         
         # Apply numeric extraction 
-        df_filtered["price_numeric"] = df_filtered["raw_price"].apply(extract_numeric)
-        df_filtered["area_numeric"] = df_filtered["raw_area"].apply(extract_numeric)
+        df_filtered["price_numeric"] = extract_numeric(df_filtered["raw_price"])
+        df_filtered["area_numeric"] = extract_numeric(df_filtered["raw_area"])
         
-        # 3. Remove outliers
-        price_q1 = df_filtered["price_numeric"].quantile(0.25)
-        price_q3 = df_filtered["price_numeric"].quantile(0.75)
-        price_iqr = price_q3 - price_q1
-        
-        area_q1 = df_filtered["area_numeric"].quantile(0.25)
-        area_q3 = df_filtered["area_numeric"].quantile(0.75)
-        area_iqr = area_q3 - area_q1
+        # 3. Remove outliers, with one mask computed on the underlying arrays
+        prices = df_filtered["price_numeric"].to_numpy(dtype=float, na_value=np.nan)
+        areas = df_filtered["area_numeric"].to_numpy(dtype=float, na_value=np.nan)
+        price_low, price_high = iqr_bounds(prices)
+        area_low, area_high = iqr_bounds(areas)
         
         df_clean = df_filtered[
-            (df_filtered["price_numeric"] >= price_q1 - 3 * price_iqr) &
-            (df_filtered["price_numeric"] <= price_q3 + 3 * price_iqr) &
-            (df_filtered["area_numeric"] >= area_q1 - 3 * area_iqr) &
-            (df_filtered["area_numeric"] <= area_q3 + 3 * area_iqr)
+            (prices >= price_low) & (prices <= price_high) &
+            (areas >= area_low) & (areas <= area_high)
         ]
         
         stats["removed_outliers"] = len(df_filtered) - len(df_clean)
@@ -912,86 +1303,144 @@ def clean_data(input_file):
         logger.error(f"Error cleaning data: {e}")
         return pd.DataFrame(), {"error": str(e)}
 
-def main():
-    """Main function to scrape all Tunisian real estate websites"""
+def launch_browser(playwright):
+    """Launch Chromium with the scraper's settings"""
+    # slow_mo delays every action, so it is only kept to follow a run with SCRAPER_DEBUG=1
+    return playwright.chromium.launch(
+        headless=False,  # Set to True for production
+        args=[
+            '--disable-dev-shm-usage',
+            '--disable-features=site-per-process',
+            '--disable-web-security',
+            '--no-sandbox',
+            '--window-size=1920,1080',  # Set window size
+            '--start-maximized',
+            '--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36'
+        ],
+        slow_mo=100 if DEBUG else 0,
+        timeout=180000  # 3 minutes timeout for browser operations
+    )
+
+def scrape_site(config, browser, all_properties):
+    """Scrape one website with the scraper suited to it
+    
+    The Tecnocasa regional pages are scraped right after tecnocasa.tn, on the same
+    browser, so that host is only visited by one scraper at a time.
+    """
+    site_name = config["name"]
+    logger.info(f"\n\n{'*'*80}\nScraping website: {site_name}\n{'*'*80}")
+    
+    if site_name == "remax.com.tn":
+        try:
+            # First, attempt to use the specialized Remax scraper function
+            return scrape_remax_site(config, browser, all_properties)
+        except Exception as e:
+            logger.error(f"Error using specialized Remax scraper: {e}. Falling back to standard scraper.")
+            # Fallback to standard scraper if specialized one fails
+            return scrape_properties(config, browser, all_properties)
+    
+    site_properties = scrape_properties(config, browser, all_properties)
+    if site_name == "tecnocasa.tn":
+        logger.info("\n\nStarting specialized scraping for Tecnocasa regional websites...")
+        tecnocasa_properties = scrape_tecnocasa_regions(browser, all_properties)
+        logger.info(f"Added {len(tecnocasa_properties)} properties from Tecnocasa regions")
+        site_properties = site_properties + tecnocasa_properties
+    return site_properties
+
+def scrape_site_in_thread(config, all_properties):
+    """
+    Scrape one website from a worker thread
+    
+    The sync Playwright API can't be shared between threads, so each worker
+    starts its own Playwright and browser.
+    """
+    with sync_playwright() as playwright:
+        browser = launch_browser(playwright)
+        try:
+            return scrape_site(config, browser, all_properties)
+        finally:
+            browser.close()
+
+def save_progress(site_name, site_properties, all_properties):
+    """Log a finished site and append its properties to the session's checkpoint file
+    
+    Only the new site's properties are written, the combined CSV and JSON are saved
+    once at the end of the run.
+    """
+    logger.info(f"Finished scraping {site_name}. Got {len(site_properties)} properties.")
+    logger.info(f"Running total: {len(all_properties)} properties collected so far")
+    
+    checkpoint_file = os.path.join(RAW_DATA_FOLDER, f"all_properties_{TIMESTAMP}.ndjson")
+    with open(checkpoint_file, "ab") as f:
+        f.writelines(map(dump_json_line, site_properties))
+    
+    logger.info(f"Appended {len(site_properties)} properties to {checkpoint_file}")
+
+def main(browser=None):
+    """Main function to scrape all Tunisian real estate websites
+    
+    The websites are scraped concurrently, up to MAX_PARALLEL_SITES at a time, each in
+    its own thread and browser; the Tecnocasa regions follow tecnocasa.tn in its thread
+    instead of waiting for every other site to finish. An already launched Playwright
+    browser can be passed in (e.g. by a test session) to avoid launching new ones; the
+    websites then run one after another on it, and it is left open for the caller.
+    """
     start_time = datetime.now()
     logger.info(f"Starting Tunisian property scraper at {start_time}")
     all_properties = []
     
-    with sync_playwright() as playwright:
-        # Set up browser with slow_mo for stability in case of complex pages
-        browser = playwright.chromium.launch(
-            headless=False,  # Set to True for production
-            args=[
-                '--disable-dev-shm-usage',
-                '--disable-features=site-per-process',
-                '--disable-web-security',
-                '--no-sandbox',
-                '--window-size=1920,1080',  # Set window size
-                '--start-maximized',
-                '--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36'
-            ],
-            slow_mo=100,  # Add a small delay between actions for stability
-            timeout=180000  # 3 minutes timeout for browser operations
-        )
-        
-        try:            # Process each website in sequence
-            for config in SITE_CONFIGS:
-                site_name = config["name"]
-                logger.info(f"\n\n{'*'*80}\nScraping website: {site_name}\n{'*'*80}")
-                
-                # Scrape the current site
-                if site_name == "remax.com.tn":
+    with ExitStack() as stack:
+        if browser is None:
+            # Each site is a different host, so they can all be scraped at once;
+            # every worker launches its own browser
+            with ThreadPoolExecutor(max_workers=MAX_PARALLEL_SITES) as executor:
+                futures = {
+                    executor.submit(scrape_site_in_thread, config, all_properties): config["name"]
+                    for config in SITE_CONFIGS
+                }
+                for future in as_completed(futures):
+                    site_name = futures[future]
                     try:
-                        # First, attempt to use the specialized Remax scraper function
-                        site_properties = scrape_remax_site(config, browser, all_properties)
+                        site_properties = future.result()
                     except Exception as e:
-                        logger.error(f"Error using specialized Remax scraper: {e}. Falling back to standard scraper.")
-                        # Fallback to standard scraper if specialized one fails
-                        site_properties = scrape_properties(config, browser, all_properties)
-                else:
-                    site_properties = scrape_properties(config, browser, all_properties)
-                
-                # Log progress
-                logger.info(f"Finished scraping {site_name}. Got {len(site_properties)} properties.")
-                logger.info(f"Running total: {len(all_properties)} properties collected so far")
-                
-                # Save all properties collected so far
-                all_csv = os.path.join(RAW_DATA_FOLDER, f"all_properties_{TIMESTAMP}.csv")
-                all_json = os.path.join(RAW_DATA_FOLDER, f"all_properties_{TIMESTAMP}.json")
-                
-                save_to_csv(all_properties, all_csv)
-                save_to_json(all_properties, all_json)
-                
-                logger.info(f"Updated combined data files with {len(all_properties)} total properties")
+                        logger.error(f"Error scraping {site_name}: {e}")
+                        site_properties = []
+                    save_progress(site_name, site_properties, all_properties)
+        else:
+            # One context for every site, so they reuse its cookies and cache instead
+            # of starting cold; it is closed with the ExitStack
+            context = new_scraper_context(browser)
+            stack.callback(context.close)
+            
+            # The caller's browser belongs to this thread: process each website in sequence
+            for config in SITE_CONFIGS:
+                site_properties = scrape_site(config, context, all_properties)
+                save_progress(config["name"], site_properties, all_properties)
                 
                 # Wait between sites to be considerate
                 if config != SITE_CONFIGS[-1]:  # If not the last site
                     wait_time = 60 + random.randint(30, 90)  # 1.5-2.5 minutes
                     logger.info(f"Waiting {wait_time} seconds before scraping next site...")
                     time.sleep(wait_time)
-            
-            # Scrape Tecnocasa regional sites 
-            logger.info("\n\nStarting specialized scraping for Tecnocasa regional websites...")
-            tecnocasa_properties = scrape_tecnocasa_regions(browser, all_properties)
-            logger.info(f"Added {len(tecnocasa_properties)} properties from Tecnocasa regions")
-            
-            # Final save of raw data
-            final_raw_csv = os.path.join(RAW_DATA_FOLDER, f"all_properties_raw_{TIMESTAMP}.csv")
-            final_raw_json = os.path.join(RAW_DATA_FOLDER, f"all_properties_raw_{TIMESTAMP}.json")
-            
-            save_to_csv(all_properties, final_raw_csv)
-            save_to_json(all_properties, final_raw_json)
-            
-            logger.info(f"Saved all {len(all_properties)} raw properties")
         
-        finally:
-            # Close browser
-            browser.close()
+        # Final save of raw data
+        final_raw_csv = os.path.join(RAW_DATA_FOLDER, f"all_properties_raw_{TIMESTAMP}.csv")
+        final_raw_json = os.path.join(RAW_DATA_FOLDER, f"all_properties_raw_{TIMESTAMP}.json")
+        
+        save_to_csv(all_properties, final_raw_csv)
+        save_to_json(all_properties, final_raw_json)
+        
+        # The cleaning step reads the raw data back faster from Parquet than from CSV
+        if PYARROW_AVAILABLE:
+            final_raw_parquet = os.path.join(RAW_DATA_FOLDER, f"all_properties_raw_{TIMESTAMP}.parquet")
+            save_to_parquet(all_properties, final_raw_parquet)
+        
+        logger.info(f"Saved all {len(all_properties)} raw properties")
     
     # Clean and process the data
     logger.info("\n\nStarting data cleaning and processing...")
-    clean_df, stats = clean_data(os.path.join(RAW_DATA_FOLDER, f"all_properties_raw_{TIMESTAMP}.csv"))
+    raw_extension = "parquet" if PYARROW_AVAILABLE else "csv"
+    clean_df, stats = clean_data(os.path.join(RAW_DATA_FOLDER, f"all_properties_raw_{TIMESTAMP}.{raw_extension}"))
     
     if clean_df is not None:
         # Save cleaned data        clean_csv = os.path.join(CLEAN_DATA_FOLDER, f"all_properties_clean_{TIMESTAMP}.csv")